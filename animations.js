@@ -12,220 +12,190 @@ class AnimationController {
     init() {
         this.setupScrollAnimations();
         this.setupNavigationEffects();
-        this.setupCounterAnimations();
-        this.setupParallaxEffects();
-        this.setupProgressBars();
-        this.setupTypewriterEffect();
-        this.setupImageReveal();
     }
     
-    // Scroll-based animations
-    setupScrollAnimations() {
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    entry.target.classList.add('visible');
+    // Intersection observers, shared: one per threshold and root margin,
+    // dispatching to the callbacks registered for each element. One-shot
+    // callbacks run once the element is visible and the element is
+    // unobserved when nothing is left waiting on it.
+    observe(elements, callback, { threshold = 0, rootMargin = '0px', once = true } = {}) {
+        if (elements.length === 0) {
+            return;
+        }
+        
+        this.observers = this.observers || new Map();
+        const key = `${threshold}|${rootMargin}`;
+        let shared = this.observers.get(key);
+        if (!shared) {
+            const callbacks = new Map();
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    const remaining = (callbacks.get(entry.target) || []).filter(handler => {
+                        if (handler.once && !entry.isIntersecting) {
+                            return true;
+                        }
+                        handler.callback(entry);
+                        return !handler.once;
+                    });
                     
-                    // Handle staggered items
-                    if (entry.target.classList.contains('stagger-container')) {
-                        const items = entry.target.querySelectorAll('.stagger-item');
-                        items.forEach((item, index) => {
-                            setTimeout(() => {
-                                item.classList.add('visible');
-                            }, index * 100);
-                        });
+                    if (remaining.length > 0) {
+                        callbacks.set(entry.target, remaining);
+                    } else {
+                        callbacks.delete(entry.target);
+                        observer.unobserve(entry.target);
                     }
-                }
-            });
-        }, {
-            threshold: 0.1,
-            rootMargin: '0px 0px -50px 0px'
-        });
+                });
+            }, { threshold, rootMargin });
+            
+            shared = { observer, callbacks };
+            this.observers.set(key, shared);
+        }
         
-        // Observe all elements with animation classes
-        document.querySelectorAll('.animate-on-scroll, .stagger-container, .image-reveal').forEach(el => {
-            observer.observe(el);
+        elements.forEach(element => {
+            const handlers = shared.callbacks.get(element);
+            if (handlers) {
+                handlers.push({ callback, once });
+            } else {
+                shared.callbacks.set(element, [{ callback, once }]);
+                shared.observer.observe(element);
+            }
         });
     }
     
-    // Navigation scroll effects
-    setupNavigationEffects() {
-        let lastScrollY = window.scrollY;
-        
-        window.addEventListener('scroll', () => {
-            const scrollY = window.scrollY;
-            const nav = document.querySelector('nav');
+    // Scroll-based animations
+    setupScrollAnimations() {
+        // Observe all elements with animation classes
+        this.observe(document.querySelectorAll('.stagger-container'), (entry) => {
+            entry.target.classList.add('visible');
             
-            if (nav) {
-                // Add scrolled class
-                if (scrollY > 100) {
-                    nav.classList.add('scrolled');
-                } else {
-                    nav.classList.remove('scrolled');
-                }
-                
-                // Hide/show nav based on scroll direction
-                if (scrollY > lastScrollY && scrollY > 500) {
-                    nav.style.transform = 'translateY(-100%)';
-                } else {
-                    nav.style.transform = 'translateY(0)';
-                }
+            // Handle staggered items
+            if (entry.target.classList.contains('stagger-container')) {
+                const items = entry.target.querySelectorAll('.stagger-item');
+                items.forEach((item, index) => {
+                    this.animate(0, () => item.classList.add('visible'), index * 100);
+                });
             }
-            
-            lastScrollY = scrollY;
-        });
-    }
-    
-    // Animated counters
-    setupCounterAnimations() {
-        const counters = document.querySelectorAll('.counter');
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const target = entry.target;
-                    const finalValue = parseInt(target.dataset.count) || 100;
-                    
-                    target.classList.add('animate');
-                    
-                    let current = 0;
-                    const increment = finalValue / 50;
-                    const timer = setInterval(() => {
-                        current += increment;
-                        if (current >= finalValue) {
-                            current = finalValue;
-                            clearInterval(timer);
-                        }
-                        target.textContent = Math.floor(current);
-                    }, 40);
-                    
-                    observer.unobserve(target);
-                }
-            });
+        }, {
+            threshold: 0.1,
+            rootMargin: '0px 0px -50px 0px'
         });
-        
-        counters.forEach(counter => observer.observe(counter));
     }
     
-    // Parallax scrolling
-    setupParallaxEffects() {
-        const parallaxElements = document.querySelectorAll('.parallax-element');
-        
-        if (parallaxElements.length > 0) {
+    // Scroll scheduling: one passive listener and at most one frame per
+    // scroll burst. Every task reads layout first, then all of them write,
+    // so the browser never has to recalculate layout mid-frame.
+    onScroll(task) {
+        if (!this.scrollTasks) {
+            this.scrollTasks = [];
+            let scheduled = false;
+            
+            const frame = () => {
+                scheduled = false;
+                const scrollY = window.scrollY;
+                const states = this.scrollTasks.map(scrollTask => scrollTask.read(scrollY));
+                this.scrollTasks.forEach((scrollTask, index) => scrollTask.write(states[index]));
+            };
+            
             window.addEventListener('scroll', () => {
-                const scrolled = window.pageYOffset;
-                
-                parallaxElements.forEach(element => {
-                    const rate = scrolled * (element.dataset.rate || -0.5);
-                    element.style.transform = `translateY(${rate}px)`;
-                });
-            });
+                if (!scheduled) {
+                    scheduled = true;
+                    requestAnimationFrame(frame);
+                }
+            }, { passive: true });
         }
+        this.scrollTasks.push(task);
     }
     
-    // Progress bar animations
-    setupProgressBars() {
-        const progressBars = document.querySelectorAll('.progress-fill');
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const progressFill = entry.target;
-                    const percentage = progressFill.dataset.percentage || '100';
-                    
-                    progressFill.style.width = percentage + '%';
-                    progressFill.classList.add('animate');
-                    
-                    observer.unobserve(progressFill);
+    // Animation clock: a single requestAnimationFrame loop drives every
+    // timed animation, calling step(progress) with progress from 0 to 1
+    // after `delay` ms. Time stands still while the page is hidden, and
+    // under prefers-reduced-motion animations jump to their final state.
+    animate(duration, step, delay = 0) {
+        if (!this.animations) {
+            this.animations = new Set();
+            this.clockTime = 0;
+            this.frameId = null;
+            this.reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
+            
+            document.addEventListener('visibilitychange', () => {
+                if (document.hidden) {
+                    cancelAnimationFrame(this.frameId);
+                    this.frameId = null;
+                } else {
+                    this.startClock();
                 }
             });
-        });
+        }
         
-        progressBars.forEach(bar => observer.observe(bar));
+        if (this.reducedMotion.matches) {
+            step(1);
+            return;
+        }
+        this.animations.add({ start: this.clockTime + delay, duration, step });
+        this.startClock();
     }
     
-    // Typewriter effect
-    setupTypewriterEffect() {
-        const typewriterElements = document.querySelectorAll('.typewriter');
+    startClock() {
+        if (this.frameId !== null || this.animations.size === 0 || document.hidden) {
+            return;
+        }
         
-        typewriterElements.forEach(element => {
-            const text = element.textContent;
-            element.textContent = '';
-            element.style.width = '0';
+        let lastFrame = null;
+        const tick = (now) => {
+            // Only time spent running counts, so a paused clock resumes where it stopped
+            this.clockTime += lastFrame === null ? 0 : now - lastFrame;
+            lastFrame = now;
             
-            const observer = new IntersectionObserver((entries) => {
-                entries.forEach(entry => {
-                    if (entry.isIntersecting) {
-                        this.typeText(element, text);
-                        observer.unobserve(element);
-                    }
-                });
+            this.animations.forEach(animation => {
+                const elapsed = this.clockTime - animation.start;
+                if (elapsed < 0) {
+                    return;
+                }
+                const progress = Math.min(elapsed / Math.max(animation.duration, 1), 1);
+                animation.step(progress);
+                if (progress === 1) {
+                    this.animations.delete(animation);
+                }
             });
             
-            observer.observe(element);
-        });
+            this.frameId = this.animations.size > 0 ? requestAnimationFrame(tick) : null;
+        };
+        this.frameId = requestAnimationFrame(tick);
     }
     
-    typeText(element, text) {
-        let index = 0;
-        const speed = 100;
-        
-        function type() {
-            if (index < text.length) {
-                element.textContent += text.charAt(index);
-                index++;
-                setTimeout(type, speed);
-            }
+    // Navigation scroll effects
+    setupNavigationEffects() {
+        const nav = document.querySelector('nav');
+        if (!nav) {
+            return;
         }
         
-        // Animate width
-        element.style.width = '100%';
-        setTimeout(type, 500);
-    }
-    
-    // Image reveal effect
-    setupImageReveal() {
-        const imageElements = document.querySelectorAll('.image-reveal');
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    entry.target.classList.add('animate');
-                    observer.unobserve(entry.target);
+        let lastScrollY = window.scrollY;
+        let scrolled = null;
+        let hidden = null;
+        
+        this.onScroll({
+            read: (scrollY) => {
+                const state = {
+                    // Add scrolled class
+                    scrolled: scrollY > 100,
+                    // Hide/show nav based on scroll direction
+                    hidden: scrollY > lastScrollY && scrollY > 500
+                };
+                lastScrollY = scrollY;
+                return state;
+            },
+            write: (state) => {
+                if (state.scrolled !== scrolled) {
+                    scrolled = state.scrolled;
+                    nav.classList.toggle('scrolled', scrolled);
                 }
-            });
+                if (state.hidden !== hidden) {
+                    hidden = state.hidden;
+                    nav.style.transform = hidden ? 'translateY(-100%)' : 'translateY(0)';
+                }
+            }
         });
-        
-        imageElements.forEach(img => observer.observe(img));
-    }
-    
-    // Smooth scroll to sections
-    static smoothScrollTo(targetId) {
-        const target = document.getElementById(targetId);
-        if (target) {
-            const offsetTop = target.offsetTop - 80;
-            window.scrollTo({
-                top: offsetTop,
-                behavior: 'smooth'
-            });
-        }
-    }
-    
-    // Loading animation
-    static showLoading() {
-        const loader = document.createElement('div');
-        loader.className = 'loading-spinner';
-        loader.style.position = 'fixed';
-        loader.style.top = '50%';
-        loader.style.left = '50%';
-        loader.style.transform = 'translate(-50%, -50%)';
-        loader.style.zIndex = '9999';
-        document.body.appendChild(loader);
-        
-        return loader;
-    }
-    
-    static hideLoading(loader) {
-        if (loader && loader.parentNode) {
-            loader.remove();
-        }
     }
 }
 
@@ -233,44 +203,3 @@ class AnimationController {
 document.addEventListener('DOMContentLoaded', () => {
     new AnimationController();
 });
-
-// Utility functions for manual animation triggering
-window.AnimationUtils = {
-    fadeIn: (element, duration = 500) => {
-        element.style.opacity = '0';
-        element.style.transition = `opacity ${duration}ms ease`;
-        
-        setTimeout(() => {
-            element.style.opacity = '1';
-        }, 10);
-    },
-    
-    slideInFromLeft: (element, duration = 500) => {
-        element.style.transform = 'translateX(-100%)';
-        element.style.transition = `transform ${duration}ms cubic-bezier(0.25, 0.46, 0.45, 0.94)`;
-        
-        setTimeout(() => {
-            element.style.transform = 'translateX(0)';
-        }, 10);
-    },
-    
-    bounceIn: (element, duration = 600) => {
-        element.style.transform = 'scale(0)';
-        element.style.transition = `transform ${duration}ms cubic-bezier(0.68, -0.55, 0.265, 1.55)`;
-        
-        setTimeout(() => {
-            element.style.transform = 'scale(1)';
-        }, 10);
-    }
-};
-
-// Performance optimization
-if ('requestIdleCallback' in window) {
-    requestIdleCallback(() => {
-        // Preload critical animations
-        const criticalElements = document.querySelectorAll('.hero, nav, .cta-button');
-        criticalElements.forEach(el => {
-            el.style.willChange = 'transform, opacity';
-        });
-    });
-}
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Philip Wright website tooling
+- load: page views against serve.py in its modes, with and without compression and caching
+- optimize: optimize.py stage timings on large synthetic CSS and JavaScript
+- sendfile: serve.py throughput and server CPU per GB, sendfile vs userspace copy
+- all: load and optimize
+Run with: python3 bench.py {load,optimize,sendfile,all} [--output FILE]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from html.parser import HTMLParser
+
+import optimize
+
+SERVE = Path(__file__).resolve().with_name('serve.py')
+HOST = '127.0.0.1'
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+def start_server(directory, *flags):
+    """Start serve.py on a free port; returns (process, port) once it accepts connections"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(SERVE), '--host', HOST, '--port', str(port),
+         '--directory', str(directory), '--no-browser', *flags],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return process, port
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"serve.py {' '.join(flags)} did not start")
+            time.sleep(0.05)
+
+def stop_server(process):
+    """Stop a server started by start_server; returns the CPU seconds it used"""
+    process.send_signal(signal.SIGINT)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return usage.ru_utime + usage.ru_stime
+
+def download(port, path, count, headers=()):
+    """GET path count times over one keep-alive connection; returns body bytes received"""
+    request = (f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+               + ''.join(f"{name}: {value}\r\n" for name, value in headers)
+               + "\r\n").encode('ascii')
+    buffer = memoryview(bytearray(1 << 20))
+    total = 0
+    with socket.create_connection((HOST, port)) as sock:
+        reader = sock.makefile('rb', buffering=1 << 16)
+        for _ in range(count):
+            sock.sendall(request)
+            length = 0
+            while True:
+                line = reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'content-length':
+                    length = int(value)
+            remaining = length
+            while remaining:
+                read = reader.readinto(buffer[:min(remaining, len(buffer))])
+                if not read:
+                    raise ConnectionError("server closed the connection mid-body")
+                remaining -= read
+            total += length
+    return total
+
+def bench_sendfile(size_mb=64, requests=16):
+    """Serve one large file with and without sendfile(2)"""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory, 'video.mp4')
+        chunk = os.urandom(1024 * 1024)
+        with open(path, 'wb') as file:
+            for _ in range(size_mb):
+                file.write(chunk)
+        
+        for mode, flags in (('copy', ('--no-sendfile',)), ('sendfile', ())):
+            process, port = start_server(directory, *flags)
+            try:
+                download(port, '/video.mp4', 1)     # warm the page cache
+                start = time.perf_counter()
+                received = download(port, '/video.mp4', requests)
+                seconds = time.perf_counter() - start
+            finally:
+                cpu_seconds = stop_server(process)
+            gigabytes = received / 1e9
+            results.append({
+                'mode': mode,
+                'file_bytes': size_mb * 1024 * 1024,
+                'requests': requests,
+                'bytes': received,
+                'seconds': round(seconds, 4),
+                'throughput_mb_s': round(received / 1e6 / seconds, 1),
+                'server_cpu_seconds': round(cpu_seconds, 4),
+                'server_cpu_seconds_per_gb': round(cpu_seconds / gigabytes, 4),
+            })
+    return results
+
+def print_sendfile_report(results):
+    """Server CPU includes start-up, which both modes pay alike"""
+    print(f"{'mode':<10} {'MB/s':>10} {'server CPU s/GB':>16}")
+    for result in results:
+        print(f"{result['mode']:<10} {result['throughput_mb_s']:>10,.1f}"
+              f" {result['server_cpu_seconds_per_gb']:>16.3f}")
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+# Load: virtual users load a page and its same-origin subresources over one
+# keep-alive connection each, page view after page view. Client and server
+# share the machine, so compare results from the same host only.
+
+ACCEPT_ENCODING = 'gzip, deflate, br, zstd'
+
+# (name, serve.py flags, Accept-Encoding, whether clients keep an HTTP cache)
+LOAD_SCENARIOS = (
+    ('uncompressed', ('--dev',), None, False),
+    ('compressed', ('--dev',), ACCEPT_ENCODING, False),
+    ('compressed+memory-cache', ('--dev', '--memory-cache', '64'), ACCEPT_ENCODING, False),
+    ('repeat-view', ('--memory-cache', '64'), ACCEPT_ENCODING, True),
+)
+
+SUBRESOURCE_RELS = {'stylesheet', 'preload', 'modulepreload', 'icon', 'manifest'}
+
+class _Subresources(HTMLParser):
+    """URLs a browser fetches while loading a page"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls = []
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        if tag == 'link' and SUBRESOURCE_RELS & set(attrs.get('rel', '').lower().split()):
+            self.urls.append(attrs.get('href', ''))
+        elif tag in ('script', 'img') and attrs.get('src'):
+            self.urls.append(attrs['src'])
+
+def page_resources(port, page):
+    """The page plus its same-origin subresources, as request paths"""
+    with urllib.request.urlopen(f'http://{HOST}:{port}{page}') as response:
+        parser = _Subresources()
+        parser.feed(response.read().decode('utf-8', 'replace'))
+    paths = [page]
+    for url in parser.urls:
+        parts = urllib.parse.urlsplit(urllib.parse.urljoin(page, url))
+        if parts.scheme or parts.netloc or not parts.path:
+            continue
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+async def fetch(reader, writer, path, headers):
+    """One GET on an open connection; returns (status, headers, wire bytes, body bytes)"""
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+                  + ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+                  + "\r\n").encode('latin-1'))
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    response_headers = {}
+    wire = len(status_line)
+    while True:
+        line = await reader.readline()
+        wire += len(line)
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+    length = 0 if status in (204, 304) else int(response_headers.get('content-length', 0))
+    await reader.readexactly(length)
+    return status, response_headers, wire + length, length
+
+def is_fresh(headers):
+    """Whether a browser would reuse the response without asking again"""
+    directives = [d.strip().lower() for d in headers.get('cache-control', '').split(',')]
+    if 'no-cache' in directives or 'no-store' in directives:
+        return False
+    return any(d.startswith('max-age=') and d[8:].isdigit() and int(d[8:]) > 0
+               for d in directives)
+
+async def browse(port, paths, accept_encoding, browser_cache, state):
+    """One virtual user viewing the page until the run has enough page views"""
+    cache = {}      # path -> (fresh, etag)
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while state['started'] < state['page_views']:
+            state['started'] += 1
+            view_wire = view_body = 0
+            for path in paths:
+                fresh, etag = cache.get(path, (False, None))
+                if fresh:
+                    state['cache_hits'] += 1
+                    continue
+                headers = {}
+                if accept_encoding:
+                    headers['Accept-Encoding'] = accept_encoding
+                if etag:
+                    headers['If-None-Match'] = etag
+                start = time.perf_counter()
+                status, response, wire, body = await fetch(reader, writer, path, headers)
+                state['latencies'].append(time.perf_counter() - start)
+                state['statuses'][status] = state['statuses'].get(status, 0) + 1
+                view_wire += wire
+                view_body += body
+                if browser_cache and status == 200:
+                    cache[path] = (is_fresh(response), response.get('etag'))
+                if response.get('connection', '').lower() == 'close':
+                    writer.close()
+                    reader, writer = await asyncio.open_connection(HOST, port)
+            state['wire_bytes'].append(view_wire)
+            state['body_bytes'].append(view_body)
+    finally:
+        writer.close()
+
+async def drive(port, paths, concurrency, page_views, accept_encoding, browser_cache):
+    state = {'started': 0, 'page_views': page_views, 'latencies': [], 'statuses': {},
+             'wire_bytes': [], 'body_bytes': [], 'cache_hits': 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(browse(port, paths, accept_encoding, browser_cache, state)
+                           for _ in range(concurrency)))
+    state['seconds'] = time.perf_counter() - start
+    return state
+
+def bench_load(directory, page='/', concurrency=32, page_views=500, scenarios=None):
+    """Page views per second, latency and transfer size for each scenario"""
+    results = []
+    for name, flags, accept_encoding, browser_cache in LOAD_SCENARIOS:
+        if scenarios and name not in scenarios:
+            continue
+        process, port = start_server(directory, '--no-access-log', *flags)
+        try:
+            paths = page_resources(port, page)
+            # Warm the server's caches and the page cache, as a running site would be
+            asyncio.run(drive(port, paths, 1, 1, accept_encoding, False))
+            state = asyncio.run(drive(port, paths, concurrency, page_views,
+                                      accept_encoding, browser_cache))
+        finally:
+            cpu_seconds = stop_server(process)
+        latencies = sorted(state['latencies'])
+        seconds = state['seconds']
+        results.append({
+            'scenario': name,
+            'server_flags': list(flags),
+            'accept_encoding': accept_encoding,
+            'browser_cache': browser_cache,
+            'page': page,
+            'resources_per_page_view': len(paths),
+            'concurrency': concurrency,
+            'page_views': len(state['wire_bytes']),
+            'requests': len(latencies),
+            'cache_hits': state['cache_hits'],
+            'statuses': {str(code): count for code, count in sorted(state['statuses'].items())},
+            'seconds': round(seconds, 4),
+            'requests_per_second': round(len(latencies) / seconds, 1),
+            'page_views_per_second': round(len(state['wire_bytes']) / seconds, 1),
+            'latency_ms': {
+                'p50': round(percentile(latencies, 0.50) * 1000, 3),
+                'p95': round(percentile(latencies, 0.95) * 1000, 3),
+                'p99': round(percentile(latencies, 0.99) * 1000, 3),
+                'max': round(latencies[-1] * 1000 if latencies else 0, 3),
+            },
+            'bytes_per_page_view': round(statistics.fmean(state['wire_bytes'])),
+            'body_bytes_per_page_view': round(statistics.fmean(state['body_bytes'])),
+            'server_cpu_seconds': round(cpu_seconds, 4),
+        })
+    return results
+
+def print_load_report(results):
+    print(f"{'scenario':<25} {'req/s':>8} {'views/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+          f" {'p99 ms':>8} {'KB/view':>8}")
+    for result in results:
+        latency = result['latency_ms']
+        print(f"{result['scenario']:<25} {result['requests_per_second']:>8,.0f}"
+              f" {result['page_views_per_second']:>8,.0f} {latency['p50']:>8.2f}"
+              f" {latency['p95']:>8.2f} {latency['p99']:>8.2f}"
+              f" {result['bytes_per_page_view'] / 1024:>8.1f}")
+
+# Optimize: each optimize.py stage on generated inputs far larger than the
+# site's own, so per-byte costs dominate fixed ones. Inputs are seeded and
+# therefore identical from run to run.
+
+SYNTHETIC_DECLARATIONS = (
+    ('color', ('#333333', 'white', 'rgba(0, 0, 0, 0.5)', '#C9B037')),
+    ('margin', ('0px 0px 0px 0px', '10px auto', '0 1rem 0 1rem', '0.5em')),
+    ('padding', ('20px', '0px 40px', '1.0rem 2.0rem 1.0rem 2.0rem')),
+    ('display', ('flex', 'block', 'grid', 'none', 'inline-block')),
+    ('font-size', ('1.0rem', '16px', '0.875em', '2.50rem')),
+    ('transition', ('all 0.3s ease-in-out', 'opacity 300ms ease', 'transform .6s ease')),
+    ('transform', ('translateY(0px)', 'scale(1.05)', 'translateX(-50%)')),
+    ('background', ('linear-gradient(135deg, #667eea 0%, #764ba2 100%)', '#FFFFFF')),
+    ('box-shadow', ('0 4px 15px rgba(201, 176, 55, 0.3)', 'none')),
+    ('border-radius', ('4px', '50%', '0.25rem')),
+)
+
+def synthetic_css(size, components, seed=0):
+    """Stylesheet of about `size` bytes styling `components` components, round robin"""
+    rng = random.Random(seed)
+    
+    def block(selector, count, indent='    '):
+        declarations = rng.sample(SYNTHETIC_DECLARATIONS, count)
+        body = ''.join(f"{indent}{name}: {rng.choice(values)};\n"
+                       for name, values in declarations)
+        return f"{indent[4:]}{selector} {{\n{body}{indent[4:]}}}\n\n"
+    
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        c = n % components
+        part = (
+            f"/* Component {n}: layout, states and motion */\n"
+            + block(f".comp-{c}", rng.randint(3, 7))
+            + block(f".comp-{c} .comp-{c}__item, .comp-{c} > li", rng.randint(2, 5))
+            + block(f".comp-{c}__item:hover, .comp-{c}--active", rng.randint(2, 4))
+            + f"@media (max-width: 768px) {{\n"
+            + block(f".comp-{c}", rng.randint(2, 4), indent='        ')
+            + f"}}\n\n@keyframes comp-{n}-enter {{\n"
+            + f"    from {{ opacity: 0; transform: translateY(30px); }}\n"
+            + f"    to {{ opacity: 1; transform: translateY(0px); }}\n}}\n\n"
+            + block(f".comp-{c}.is-visible", 1)[:-3]
+            + f"    animation: comp-{n}-enter 0.6s ease both;\n}}\n\n"
+        )
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return ''.join(parts)
+
+def synthetic_js(size, components, seed=0):
+    """Script of about `size` bytes with a function per component"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        c = n % components
+        part = f"""// Component {n}: toggles item state and reports it
+function initComponent{n}(root) {{
+    const items = root.querySelectorAll('.comp-{c}__item');
+    const limit = {rng.randint(1, 1000)} / 2.5;   /* upper bound */
+    items.forEach((item, index) => {{
+        item.addEventListener('click', () => {{
+            item.classList.toggle('comp-{c}--active');
+            const label = `Item ${{index + 1}} of ${{items.length}}`;
+            if (/^\\s*$/.test(label) || index > limit) {{
+                return;
+            }}
+            root.setAttribute('aria-label', label);
+        }});
+    }});
+    return {{ count: items.length, ratio: items.length / limit }};
+}}
+
+"""
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return ''.join(parts)
+
+def synthetic_html(components, stylesheet, script):
+    """Page using every other component, the first few above the fold"""
+    sections = []
+    for c in range(0, components, 2):
+        items = ''.join(f'<li class="comp-{c}__item">Item {i}</li>\n' for i in range(3))
+        sections.append(f'<section class="comp-{c}">\n<ul>\n{items}</ul>\n</section>\n')
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+            f'<title>Synthetic page</title>\n<link rel="stylesheet" href="{stylesheet}">\n'
+            f'</head>\n<body>\n<header class="comp-0"><nav><ul>\n'
+            f'<li class="comp-0__item">Home</li>\n</ul></nav></header>\n'
+            f'<main>\n{"".join(sections)}</main>\n'
+            f'<script src="{script}"></script>\n</body>\n</html>\n')
+
+def time_stage(stage, function, data, repeat):
+    """Best and median wall time of function(data) over `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = function(data)
+        timings.append(time.perf_counter() - start)
+    size = len(output) if isinstance(output, (str, bytes)) else None
+    best = min(timings)
+    return {
+        'stage': stage,
+        'input_bytes': len(data),
+        'output_bytes': size,
+        'repeat': repeat,
+        'min_ms': round(best * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'throughput_mb_s': round(len(data) / 1e6 / best, 2) if best else None,
+    }
+
+def bench_optimize(css_kb=512, js_kb=512, repeat=3, components=200):
+    """Time the CSS, JavaScript and HTML stages of optimize.py"""
+    css = synthetic_css(css_kb * 1024, components)
+    js = synthetic_js(js_kb * 1024, components)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        stylesheet = os.path.join(directory, 'styles.css')
+        script = os.path.join(directory, 'script.js')
+        document = os.path.join(directory, 'index.html')
+        page = synthetic_html(components, 'styles.css', 'script.js')
+        Path(stylesheet).write_text(css, encoding='utf-8')
+        Path(script).write_text(js, encoding='utf-8')
+        Path(document).write_text(page, encoding='utf-8')
+        
+        usage = optimize.collect_css_usage([document, script, stylesheet])
+        minified_css = optimize.minify_css(css)
+        minified_js = optimize.minify_js(js)
+        stages = [
+            ('css.tokenize', lambda data: list(optimize.tokenize_css(data)), css),
+            ('css.minify', optimize.minify_css, css),
+            ('css.collect_usage', lambda data: optimize.collect_css_usage(
+                [document, script, stylesheet]), css),
+            ('css.purge', lambda data: optimize.purge_css(data, usage)[0], css),
+            ('css.critical', lambda data: optimize.inline_critical_css(page, document)[1], css),
+            ('js.tokenize', lambda data: list(optimize.tokenize_js(data)), js),
+            ('js.minify', optimize.minify_js, js),
+            ('js.verify', lambda data: optimize.verify_minified_js(data, minified_js), js),
+            ('html.minify', optimize.minify_html, page),
+        ]
+        for name, _, compress in optimize.compression_codecs():
+            stages.append((f'css.compress.{name}', compress, minified_css.encode('utf-8')))
+            stages.append((f'js.compress.{name}', compress, minified_js.encode('utf-8')))
+        stages.append(('fingerprint', lambda data: optimize.hashlib.sha256(data).hexdigest(),
+                       minified_css.encode('utf-8')))
+        for stage, function, data in stages:
+            results.append(time_stage(stage, function, data, repeat))
+    return results
+
+def print_optimize_report(results):
+    print(f"{'stage':<22} {'input KB':>10} {'output KB':>10} {'min ms':>10} {'MB/s':>8}")
+    for result in results:
+        output = result['output_bytes']
+        output = f"{output / 1024:>10,.1f}" if output is not None else f"{'-':>10}"
+        print(f"{result['stage']:<22} {result['input_bytes'] / 1024:>10,.1f} {output}"
+              f" {result['min_ms']:>10,.1f} {result['throughput_mb_s'] or 0:>8,.2f}")
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=SERVE.parent, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(results, output, command):
+    report = {
+        'benchmark': command,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    Path(output).write_text(json.dumps(report, indent=2) + '\n')
+    print(f"📝 Results written to {output}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the website tooling")
+    commands = parser.add_subparsers(dest='command', required=True)
+    sendfile = commands.add_parser('sendfile', help="serve.py large-file throughput and CPU")
+    sendfile.add_argument('--size', type=int, default=64, metavar='MB',
+                          help="size of the served file (default: 64)")
+    sendfile.add_argument('--requests', type=int, default=16,
+                          help="downloads per mode (default: 16)")
+    
+    load = commands.add_parser('load', help="page views against serve.py in each mode")
+    optimize_parser = commands.add_parser('optimize', help="optimize.py stages on large inputs")
+    every = commands.add_parser('all', help="load and optimize")
+    for command in (load, every):
+        command.add_argument('--concurrency', type=int, default=32,
+                             help="virtual users, one connection each (default: 32)")
+        command.add_argument('--page-views', type=int, default=500,
+                             help="page views per scenario (default: 500)")
+        command.add_argument('--page', default='/', help="page to view (default: /)")
+        command.add_argument('--directory', default=str(SERVE.parent),
+                             help="directory to serve (default: the website)")
+        command.add_argument('--scenario', action='append',
+                             choices=[scenario[0] for scenario in LOAD_SCENARIOS],
+                             help="only run this scenario (repeatable; default: all)")
+    for command in (optimize_parser, every):
+        command.add_argument('--css-kb', type=int, default=512,
+                             help="size of the generated stylesheet (default: 512)")
+        command.add_argument('--js-kb', type=int, default=512,
+                             help="size of the generated script (default: 512)")
+        command.add_argument('--repeat', type=int, default=3,
+                             help="runs per stage; the best is reported (default: 3)")
+    for command in (sendfile, load, optimize_parser, every):
+        command.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    results = {}
+    if args.command == 'sendfile':
+        print(f"📦 Serving a {args.size} MB file {args.requests} times per mode...")
+        results['sendfile'] = bench_sendfile(args.size, args.requests)
+        print_sendfile_report(results['sendfile'])
+    if args.command in ('load', 'all'):
+        print(f"🌐 {args.page_views} page views of {args.page} per scenario, "
+              f"{args.concurrency} concurrent users...")
+        results['load'] = bench_load(args.directory, args.page, args.concurrency,
+                                     args.page_views, args.scenario)
+        print_load_report(results['load'])
+    if args.command in ('optimize', 'all'):
+        print(f"⚙️  Timing optimize.py on {args.css_kb} KB of CSS and {args.js_kb} KB of JavaScript...")
+        results['optimize'] = bench_optimize(args.css_kb, args.js_kb, args.repeat)
+        print_optimize_report(results['optimize'])
+    if args.output:
+        if args.command != 'all':
+            results = results[args.command]
+        write_results(results, args.output, args.command)
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,53 @@
 """
 Advanced CSS Animation Generator for Philip Wright Website
 Creates smooth, professional animations and interactive effects
+- animations.json selects the features to generate and tunes their
+  durations, easings and breakpoints; only what it selects is emitted
+Run with: python3 create-animations.py [--spec animations.json]
 """
 
 import os
+import sys
+import json
+import argparse
+from string import Template
 from pathlib import Path
 
-def create_advanced_animations():
-    """Generate advanced CSS animations"""
-    
-    animations_css = """
-/* ========================================
-   ADVANCED ANIMATIONS & INTERACTIONS
-   Philip Wright Professional Portfolio
-   ======================================== */
+from optimize import write_if_changed, rewrite_html_file
 
-/* Smooth scroll behavior */
-html {
-    scroll-behavior: smooth;
+# Optional: TOML specs need tomllib (Python 3.11+)
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+SPEC_FILE = 'animations.json'
+
+HTML_FILE = 'index.html'
+
+# Named easings a spec can refer to instead of spelling out the curve
+EASINGS = {
+    'smooth': 'cubic-bezier(0.25, 0.46, 0.45, 0.94)',
+    'bounce': 'cubic-bezier(0.68, -0.55, 0.265, 1.55)',
 }
 
-/* Loading animation */
-@keyframes fadeInUp {
+BREAKPOINTS = {'mobile': '768px'}
+
+OBSERVER = {'threshold': 0.1, 'root_margin': '0px 0px -50px 0px'}
+
+# Classes added to index.html, by selector, when there is no spec
+DEFAULT_CLASSES = {
+    'section.hero': ['animate-on-scroll'],
+    'section.about': ['animate-on-scroll'],
+    'section.work': ['animate-on-scroll', 'stagger-container'],
+    'section.contact': ['animate-on-scroll'],
+    '.work-card': ['stagger-item'],
+}
+
+# Keyframes are emitted when a selected feature uses them, or when the
+# spec lists them under "keyframes" for the site's own stylesheets
+KEYFRAMES = {
+    'fadeInUp': """@keyframes fadeInUp {
     from {
         opacity: 0;
         transform: translateY(30px);
@@ -32,8 +58,8 @@ html {
         transform: translateY(0);
     }
 }
-
-@keyframes slideInLeft {
+""",
+    'slideInLeft': """@keyframes slideInLeft {
     from {
         opacity: 0;
         transform: translateX(-50px);
@@ -43,8 +69,8 @@ html {
         transform: translateX(0);
     }
 }
-
-@keyframes slideInRight {
+""",
+    'slideInRight': """@keyframes slideInRight {
     from {
         opacity: 0;
         transform: translateX(50px);
@@ -54,8 +80,8 @@ html {
         transform: translateX(0);
     }
 }
-
-@keyframes scaleIn {
+""",
+    'scaleIn': """@keyframes scaleIn {
     from {
         opacity: 0;
         transform: scale(0.8);
@@ -65,42 +91,158 @@ html {
         transform: scale(1);
     }
 }
-
-@keyframes goldShimmer {
+""",
+    'goldShimmer': """@keyframes goldShimmer {
     0% { background-position: -200% center; }
     100% { background-position: 200% center; }
 }
+""",
+    'typing': """@keyframes typing {
+    from { width: 0; }
+    to { width: 100%; }
+}
+""",
+    'blink-caret': """@keyframes blink-caret {
+    from, to { border-color: transparent; }
+    50% { border-color: #c9b037; }
+}
+""",
+    'countUp': """@keyframes countUp {
+    from { opacity: 0; transform: translateY(20px); }
+    to { opacity: 1; transform: translateY(0); }
+}
+""",
+    'spin': """@keyframes spin {
+    to { transform: rotate(360deg); }
+}
+""",
+    'float': """@keyframes float {
+    0%, 100% { transform: translateY(0px); }
+    50% { transform: translateY(-10px); }
+}
+""",
+}
 
-/* Page load animations */
-.animate-on-scroll {
+# The feature catalogue, in output order. Each feature has default
+# parameters, CSS (a template over them, or a function of all the
+# resolved features), optional CSS for the mobile breakpoint, the
+# keyframes it animates with and the controller modules it needs.
+# Accessibility features come last so they override everything else.
+
+def _hero_entrance_css(params, features):
+    delay = parse_seconds(params['delay'])
+    step = parse_seconds(params['step'])
+    rules = []
+    for index, target in enumerate(params['targets']):
+        start = format_seconds(delay + index * step)
+        rules.append(f".hero {target} {{\n"
+                     f"    animation: fadeInUp {params['duration']} {params['easing']} {start} both;\n"
+                     f"}}\n")
+    return "/* Hero section entrance */\n" + "\n".join(rules)
+
+def _stagger_css(params, features):
+    step = parse_seconds(params['step'])
+    delays = ''.join(f".stagger-item:nth-child({n}) {{ transition-delay: "
+                     f"{format_seconds(n * step)}; }}\n"
+                     for n in range(1, params['items'] + 1))
+    return Template("""/* Staggered animations for lists */
+.stagger-item {
     opacity: 0;
-    transform: translateY(30px);
-    transition: all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+    transform: translateY($distance);
+    transition: all $duration $easing;
 }
 
-.animate-on-scroll.visible {
+""").substitute(params) + delays + """
+.stagger-item.visible {
     opacity: 1;
     transform: translateY(0);
 }
+"""
 
-/* Hero section enhanced animations */
-.hero h1 {
-    animation: fadeInUp 1.2s ease-out 0.2s both;
+def _high_contrast_css(params, features):
+    rules = ["""    .btn-primary {
+        border: 2px solid currentColor;
+    }
+"""]
+    if 'card-overlay' in features:
+        rules.append("""    .card-overlay {
+        background: rgba(0, 0, 0, 0.8);
+    }
+""")
+    return ("/* High contrast mode support */\n@media (prefers-contrast: high) {\n"
+            + "    \n".join(rules) + "}\n")
+
+def _interactive_selectors(features):
+    selectors = []
+    if 'button-shine' in features:
+        selectors.append('.btn-primary')
+    if 'nav-underline' in features:
+        selectors.append('nav a')
+    if 'card-lift' in features:
+        selectors += ['.work-card', '.project-card']
+    return selectors
+
+def _focus_css(params, features):
+    selectors = _interactive_selectors(features)
+    if not selectors:
+        return ''
+    focus = ",\n".join(f"{selector}:focus" for selector in selectors)
+    return (f"/* Enhanced focus indicators */\n{focus} {{\n"
+            "    outline: 3px solid #c9b037;\n"
+            "    outline-offset: 3px;\n"
+            "    border-radius: 4px;\n"
+            "}\n\n"
+            f"/* Custom cursor on interactive elements */\n{','.join(chr(10) + s for s in selectors)[1:]} {{\n"
+            "    cursor: pointer;\n"
+            "}\n")
+
+FEATURES = {
+    'smooth-scroll': {
+        'description': "Smooth scrolling for in-page links",
+        'params': {},
+        'css': """/* Smooth scroll behavior */
+html {
+    scroll-behavior: smooth;
 }
-
-.hero .subtitle {
-    animation: fadeInUp 1.2s ease-out 0.4s both;
+""",
+    },
+    'scroll-reveal': {
+        'description': "`.animate-on-scroll` fades in when scrolled into view",
+        'params': {'duration': '0.8s', 'easing': 'smooth', 'distance': '30px',
+                   'mobile_distance': '20px'},
+        'css': """/* Scroll reveal animations */
+.animate-on-scroll {
+    opacity: 0;
+    transform: translateY($distance);
+    transition: all $duration $easing;
 }
 
-.hero .cta-button {
-    animation: fadeInUp 1.2s ease-out 0.6s both;
+.animate-on-scroll.visible {
+    opacity: 1;
+    transform: translateY(0);
 }
-
-/* Enhanced button hover effects */
+""",
+        'mobile': """    .animate-on-scroll {
+        transform: translateY($mobile_distance);
+    }
+""",
+        'js': ('observers', 'scroll'),
+    },
+    'hero-entrance': {
+        'description': "Hero heading and call to action rise in on load",
+        'params': {'targets': ['h1', '.subtitle', '.cta-button'], 'duration': '1.2s',
+                   'easing': 'ease-out', 'delay': '0.2s', 'step': '0.2s'},
+        'css': _hero_entrance_css,
+        'keyframes': ('fadeInUp',),
+    },
+    'button-shine': {
+        'description': "`.btn-primary` lifts and shines on hover",
+        'params': {'duration': '0.4s', 'easing': 'smooth', 'shine_duration': '0.6s'},
+        'css': """/* Enhanced button hover effects */
 .btn-primary {
     position: relative;
     overflow: hidden;
-    transition: all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+    transition: all $duration $easing;
 }
 
 .btn-primary::before {
@@ -116,7 +258,7 @@ html {
         rgba(255, 255, 255, 0.2),
         transparent
     );
-    transition: left 0.6s;
+    transition: left $shine_duration;
 }
 
 .btn-primary:hover::before {
@@ -127,24 +269,37 @@ html {
     transform: translateY(-2px);
     box-shadow: 0 15px 30px rgba(201, 176, 55, 0.4);
 }
-
-/* Card hover animations */
+""",
+    },
+    'card-lift': {
+        'description': "`.work-card` and `.project-card` lift on hover",
+        'params': {'duration': '0.4s', 'easing': 'smooth', 'lift': '-8px', 'scale': '1.02',
+                   'mobile_lift': '-4px', 'mobile_scale': '1.01'},
+        'css': """/* Card hover animations */
 .work-card, .project-card {
-    transition: all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+    transition: all $duration $easing;
     transform-origin: center;
 }
 
 .work-card:hover, .project-card:hover {
-    transform: translateY(-8px) scale(1.02);
+    transform: translateY($lift) scale($scale);
     box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
 }
-
+""",
+        'mobile': """    .work-card:hover, .project-card:hover {
+        transform: translateY($mobile_lift) scale($mobile_scale);
+    }
+""",
+    },
+    'card-overlay': {
+        'description': "`.card-overlay` fades in over a hovered card",
+        'params': {'duration': '0.4s', 'easing': 'ease'},
+        'css': """/* Enhanced card overlay */
 .work-card:hover .card-overlay,
 .project-card:hover .card-overlay {
     opacity: 1;
 }
 
-/* Enhanced card overlay */
 .card-overlay {
     position: absolute;
     top: 0;
@@ -157,34 +312,35 @@ html {
         rgba(255, 215, 0, 0.8)
     );
     opacity: 0;
-    transition: opacity 0.4s ease;
+    transition: opacity $duration $easing;
     display: flex;
     align-items: center;
     justify-content: center;
 }
-
-/* Text animations */
+""",
+    },
+    'typewriter': {
+        'description': "`.typewriter` text types itself out",
+        'params': {'duration': '3.5s', 'steps': 40, 'caret_duration': '0.75s', 'speed': 100,
+                   'start_delay': 500},
+        'css': """/* Text animations */
 .typewriter {
     overflow: hidden;
     border-right: 3px solid #c9b037;
     white-space: nowrap;
     margin: 0 auto;
-    animation: typing 3.5s steps(40, end), blink-caret 0.75s step-end infinite;
+    animation: typing $duration steps($steps, end), blink-caret $caret_duration step-end infinite;
 }
-
-@keyframes typing {
-    from { width: 0; }
-    to { width: 100%; }
-}
-
-@keyframes blink-caret {
-    from, to { border-color: transparent; }
-    50% { border-color: #c9b037; }
-}
-
-/* Navigation animations */
+""",
+        'keyframes': ('typing', 'blink-caret'),
+        'js': ('observers', 'clock', 'typewriter'),
+    },
+    'nav-effects': {
+        'description': "`nav` darkens once scrolled and hides while scrolling down",
+        'params': {'duration': '0.3s', 'easing': 'ease', 'scrolled_after': 100, 'hide_after': 500},
+        'css': """/* Navigation animations */
 nav {
-    transition: all 0.3s ease;
+    transition: all $duration $easing;
 }
 
 nav.scrolled {
@@ -192,10 +348,16 @@ nav.scrolled {
     backdrop-filter: blur(10px);
     box-shadow: 0 2px 20px rgba(0, 0, 0, 0.3);
 }
-
+""",
+        'js': ('scroll-scheduler', 'navigation'),
+    },
+    'nav-underline': {
+        'description': "`nav a` links grow an underline on hover",
+        'params': {'duration': '0.3s', 'easing': 'ease'},
+        'css': """/* Navigation link underline */
 nav a {
     position: relative;
-    transition: color 0.3s ease;
+    transition: color $duration $easing;
 }
 
 nav a::after {
@@ -206,31 +368,36 @@ nav a::after {
     bottom: -5px;
     left: 50%;
     background: linear-gradient(45deg, #c9b037, #ffd700);
-    transition: all 0.3s ease;
+    transition: all $duration $easing;
     transform: translateX(-50%);
 }
 
 nav a:hover::after {
     width: 100%;
 }
-
-/* Skills/Stats counter animation */
+""",
+    },
+    'counter': {
+        'description': "`.counter[data-count]` counts up when scrolled into view",
+        'params': {'duration': '1s', 'easing': 'ease-out', 'count_duration': 2000},
+        'css': """/* Skills/Stats counter animation */
 .counter {
     font-size: 2rem;
     font-weight: bold;
     color: #c9b037;
 }
 
-@keyframes countUp {
-    from { opacity: 0; transform: translateY(20px); }
-    to { opacity: 1; transform: translateY(0); }
-}
-
 .counter.animate {
-    animation: countUp 1s ease-out;
+    animation: countUp $duration $easing;
 }
-
-/* Parallax scrolling effect */
+""",
+        'keyframes': ('countUp',),
+        'js': ('observers', 'clock', 'counters'),
+    },
+    'parallax': {
+        'description': "`.parallax-element[data-rate]` scrolls at its own rate",
+        'params': {'rate': -0.5},
+        'css': """/* Parallax scrolling effect */
 .parallax-container {
     overflow: hidden;
 }
@@ -238,22 +405,29 @@ nav a:hover::after {
 .parallax-element {
     transition: transform 0.1s linear;
 }
-
-/* Loading spinner */
+""",
+        'js': ('observers', 'scroll-scheduler', 'parallax'),
+    },
+    'spinner': {
+        'description': "`.loading-spinner`, plus AnimationController.showLoading() and hideLoading()",
+        'params': {'duration': '1s', 'easing': 'ease-in-out'},
+        'css': """/* Loading spinner */
 .loading-spinner {
     width: 50px;
     height: 50px;
     border: 3px solid rgba(201, 176, 55, 0.3);
     border-radius: 50%;
     border-top-color: #c9b037;
-    animation: spin 1s ease-in-out infinite;
+    animation: spin $duration $easing infinite;
 }
-
-@keyframes spin {
-    to { transform: rotate(360deg); }
-}
-
-/* Progress bars */
+""",
+        'keyframes': ('spin',),
+        'js': ('loading',),
+    },
+    'progress': {
+        'description': "`.progress-fill[data-percentage]` fills when scrolled into view",
+        'params': {'duration': '1.5s', 'easing': 'smooth'},
+        'css': """/* Progress bars */
 .progress-bar {
     width: 100%;
     height: 4px;
@@ -268,43 +442,36 @@ nav a:hover::after {
     background: linear-gradient(45deg, #c9b037, #ffd700);
     border-radius: 2px;
     transform: translateX(-100%);
-    transition: transform 1.5s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+    transition: transform $duration $easing;
 }
 
 .progress-fill.animate {
     transform: translateX(0);
 }
-
-/* Floating elements */
-@keyframes float {
-    0%, 100% { transform: translateY(0px); }
-    50% { transform: translateY(-10px); }
-}
-
+""",
+        'js': ('observers', 'progress'),
+    },
+    'floating': {
+        'description': "`.floating` gently bobs up and down",
+        'params': {'duration': '3s', 'easing': 'ease-in-out'},
+        'css': """/* Floating elements */
 .floating {
-    animation: float 3s ease-in-out infinite;
+    animation: float $duration $easing infinite;
 }
-
-/* Staggered animations for lists */
-.stagger-item {
-    opacity: 0;
-    transform: translateY(20px);
-    transition: all 0.6s ease;
-}
-
-.stagger-item:nth-child(1) { transition-delay: 0.1s; }
-.stagger-item:nth-child(2) { transition-delay: 0.2s; }
-.stagger-item:nth-child(3) { transition-delay: 0.3s; }
-.stagger-item:nth-child(4) { transition-delay: 0.4s; }
-.stagger-item:nth-child(5) { transition-delay: 0.5s; }
-.stagger-item:nth-child(6) { transition-delay: 0.6s; }
-
-.stagger-item.visible {
-    opacity: 1;
-    transform: translateY(0);
-}
-
-/* Image reveal animations */
+""",
+        'keyframes': ('float',),
+    },
+    'stagger': {
+        'description': "`.stagger-item`s inside a `.stagger-container` appear one after another",
+        'params': {'items': 6, 'step': '0.1s', 'duration': '0.6s', 'easing': 'ease',
+                   'distance': '20px'},
+        'css': _stagger_css,
+        'js': ('observers', 'clock', 'scroll'),
+    },
+    'image-reveal': {
+        'description': "`.image-reveal` is uncovered by a gold sweep when scrolled into view",
+        'params': {'duration': '1s', 'easing': 'ease'},
+        'css': """/* Image reveal animations */
 .image-reveal {
     position: relative;
     overflow: hidden;
@@ -319,73 +486,26 @@ nav a:hover::after {
     height: 100%;
     background: linear-gradient(90deg, transparent, #c9b037, transparent);
     z-index: 2;
-    transition: left 1s ease;
+    transition: left $duration $easing;
 }
 
 .image-reveal.animate::before {
     left: 100%;
 }
-
-/* Responsive animations */
-@media (max-width: 768px) {
-    .animate-on-scroll {
-        transform: translateY(20px);
-    }
-    
-    .work-card:hover, .project-card:hover {
-        transform: translateY(-4px) scale(1.01);
-    }
-}
-
-/* Reduce motion for accessibility */
-@media (prefers-reduced-motion: reduce) {
-    *,
-    ::before,
-    ::after {
-        animation-duration: 0.01ms !important;
-        animation-iteration-count: 1 !important;
-        transition-duration: 0.01ms !important;
-        scroll-behavior: auto !important;
-    }
-}
-
-/* High contrast mode support */
-@media (prefers-contrast: high) {
-    .btn-primary {
-        border: 2px solid currentColor;
-    }
-    
-    .card-overlay {
-        background: rgba(0, 0, 0, 0.8);
-    }
-}
-
-/* Enhanced focus indicators */
-.btn-primary:focus,
-nav a:focus,
-.work-card:focus,
-.project-card:focus {
-    outline: 3px solid #c9b037;
-    outline-offset: 3px;
-    border-radius: 4px;
-}
-
-/* Custom cursor on interactive elements */
-.btn-primary,
-.work-card,
-.project-card,
-nav a {
-    cursor: pointer;
-}
-
-/* Video player enhancements */
+""",
+        'js': ('observers', 'image-reveal'),
+    },
+    'video-hover': {
+        'description': "`.video-container` scales and gains a gold border on hover",
+        'params': {'duration': '0.3s', 'easing': 'ease', 'scale': '1.02'},
+        'css': """/* Video player enhancements */
 .video-container {
     position: relative;
-    transition: all 0.3s ease;
+    transition: all $duration $easing;
 }
 
 .video-container:hover {
-    transform: scale(1.02);
+    transform: scale($scale);
 }
 
 .video-container::after {
@@ -397,233 +517,329 @@ nav a {
     bottom: 0;
     border: 2px solid transparent;
     border-radius: 8px;
-    transition: border-color 0.3s ease;
+    transition: border-color $duration $easing;
     pointer-events: none;
 }
 
 .video-container:hover::after {
     border-color: #c9b037;
 }
-"""
-    
-    # Write the animations CSS file
-    with open('animations.css', 'w', encoding='utf-8') as file:
-        file.write(animations_css)
-    
-    print("✅ Created advanced animations CSS file")
-    
-    # Create JavaScript for animation control
-    animation_js = """
-/* ========================================
-   ADVANCED ANIMATION CONTROLLERS
-   Philip Wright Professional Portfolio
-   ======================================== */
-
-class AnimationController {
-    constructor() {
-        this.init();
-    }
-    
-    init() {
-        this.setupScrollAnimations();
-        this.setupNavigationEffects();
-        this.setupCounterAnimations();
-        this.setupParallaxEffects();
-        this.setupProgressBars();
-        this.setupTypewriterEffect();
-        this.setupImageReveal();
+""",
+    },
+    'utils': {
+        'description': "`window.AnimationUtils`: fadeIn(), slideInFromLeft() and bounceIn()",
+        'params': {},
+        'js': ('utils',),
+    },
+    'scroll-to': {
+        'description': "AnimationController.smoothScrollTo(id), offset for the fixed header",
+        'params': {'offset': 80},
+        'js': ('scroll-to',),
+    },
+    'will-change': {
+        'description': "Hint `will-change` on key elements once the page is idle",
+        'params': {'targets': ['.hero', 'nav', '.cta-button']},
+        'js': ('will-change',),
+    },
+    'reduced-motion': {
+        'description': "Near-instant animations under `prefers-reduced-motion`",
+        'params': {},
+        'css': """/* Reduce motion for accessibility */
+@media (prefers-reduced-motion: reduce) {
+    *,
+    ::before,
+    ::after {
+        animation-duration: 0.01ms !important;
+        animation-iteration-count: 1 !important;
+        transition-duration: 0.01ms !important;
+        scroll-behavior: auto !important;
     }
-    
-    // Scroll-based animations
-    setupScrollAnimations() {
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    entry.target.classList.add('visible');
+}
+""",
+    },
+    'high-contrast': {
+        'description': "Solid borders under `prefers-contrast: high`",
+        'params': {},
+        'css': _high_contrast_css,
+    },
+    'focus': {
+        'description': "Focus rings and pointer cursors on the animated interactive elements",
+        'params': {},
+        'css': _focus_css,
+    },
+}
+
+ACCESSIBILITY_FEATURES = ('reduced-motion', 'high-contrast', 'focus')
+
+# Controller modules: an AnimationController method set up from init(),
+# a static helper, or a snippet after the controller. Templates use the
+# parameters of the feature that needs them (JS ${} is written $${}).
+
+JS_MODULES = {
+    'observers': (None, """    // Intersection observers, shared: one per threshold and root margin,
+    // dispatching to the callbacks registered for each element. One-shot
+    // callbacks run once the element is visible and the element is
+    // unobserved when nothing is left waiting on it.
+    observe(elements, callback, { threshold = 0, rootMargin = '0px', once = true } = {}) {
+        if (elements.length === 0) {
+            return;
+        }
+        
+        this.observers = this.observers || new Map();
+        const key = `$${threshold}|$${rootMargin}`;
+        let shared = this.observers.get(key);
+        if (!shared) {
+            const callbacks = new Map();
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    const remaining = (callbacks.get(entry.target) || []).filter(handler => {
+                        if (handler.once && !entry.isIntersecting) {
+                            return true;
+                        }
+                        handler.callback(entry);
+                        return !handler.once;
+                    });
                     
-                    // Handle staggered items
-                    if (entry.target.classList.contains('stagger-container')) {
-                        const items = entry.target.querySelectorAll('.stagger-item');
-                        items.forEach((item, index) => {
-                            setTimeout(() => {
-                                item.classList.add('visible');
-                            }, index * 100);
-                        });
+                    if (remaining.length > 0) {
+                        callbacks.set(entry.target, remaining);
+                    } else {
+                        callbacks.delete(entry.target);
+                        observer.unobserve(entry.target);
                     }
-                }
-            });
-        }, {
-            threshold: 0.1,
-            rootMargin: '0px 0px -50px 0px'
-        });
+                });
+            }, { threshold, rootMargin });
+            
+            shared = { observer, callbacks };
+            this.observers.set(key, shared);
+        }
         
+        elements.forEach(element => {
+            const handlers = shared.callbacks.get(element);
+            if (handlers) {
+                handlers.push({ callback, once });
+            } else {
+                shared.callbacks.set(element, [{ callback, once }]);
+                shared.observer.observe(element);
+            }
+        });
+    }
+"""),
+    'scroll': ('setupScrollAnimations', """    // Scroll-based animations
+    setupScrollAnimations() {
         // Observe all elements with animation classes
-        document.querySelectorAll('.animate-on-scroll, .stagger-container, .image-reveal').forEach(el => {
-            observer.observe(el);
+        this.observe(document.querySelectorAll('$selectors'), (entry) => {
+            entry.target.classList.add('visible');
+$stagger        }, {
+            threshold: $threshold,
+            rootMargin: '$root_margin'
         });
     }
+"""),
+    'scroll-scheduler': (None, """    // Scroll scheduling: one passive listener and at most one frame per
+    // scroll burst. Every task reads layout first, then all of them write,
+    // so the browser never has to recalculate layout mid-frame.
+    onScroll(task) {
+        if (!this.scrollTasks) {
+            this.scrollTasks = [];
+            let scheduled = false;
+            
+            const frame = () => {
+                scheduled = false;
+                const scrollY = window.scrollY;
+                const states = this.scrollTasks.map(scrollTask => scrollTask.read(scrollY));
+                this.scrollTasks.forEach((scrollTask, index) => scrollTask.write(states[index]));
+            };
+            
+            window.addEventListener('scroll', () => {
+                if (!scheduled) {
+                    scheduled = true;
+                    requestAnimationFrame(frame);
+                }
+            }, { passive: true });
+        }
+        this.scrollTasks.push(task);
+    }
+"""),
+    'clock': (None, """    // Animation clock: a single requestAnimationFrame loop drives every
+    // timed animation, calling step(progress) with progress from 0 to 1
+    // after `delay` ms. Time stands still while the page is hidden, and
+    // under prefers-reduced-motion animations jump to their final state.
+    animate(duration, step, delay = 0) {
+        if (!this.animations) {
+            this.animations = new Set();
+            this.clockTime = 0;
+            this.frameId = null;
+            this.reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
+            
+            document.addEventListener('visibilitychange', () => {
+                if (document.hidden) {
+                    cancelAnimationFrame(this.frameId);
+                    this.frameId = null;
+                } else {
+                    this.startClock();
+                }
+            });
+        }
+        
+        if (this.reducedMotion.matches) {
+            step(1);
+            return;
+        }
+        this.animations.add({ start: this.clockTime + delay, duration, step });
+        this.startClock();
+    }
     
-    // Navigation scroll effects
+    startClock() {
+        if (this.frameId !== null || this.animations.size === 0 || document.hidden) {
+            return;
+        }
+        
+        let lastFrame = null;
+        const tick = (now) => {
+            // Only time spent running counts, so a paused clock resumes where it stopped
+            this.clockTime += lastFrame === null ? 0 : now - lastFrame;
+            lastFrame = now;
+            
+            this.animations.forEach(animation => {
+                const elapsed = this.clockTime - animation.start;
+                if (elapsed < 0) {
+                    return;
+                }
+                const progress = Math.min(elapsed / Math.max(animation.duration, 1), 1);
+                animation.step(progress);
+                if (progress === 1) {
+                    this.animations.delete(animation);
+                }
+            });
+            
+            this.frameId = this.animations.size > 0 ? requestAnimationFrame(tick) : null;
+        };
+        this.frameId = requestAnimationFrame(tick);
+    }
+"""),
+    'navigation': ('setupNavigationEffects', """    // Navigation scroll effects
     setupNavigationEffects() {
+        const nav = document.querySelector('nav');
+        if (!nav) {
+            return;
+        }
+        
         let lastScrollY = window.scrollY;
+        let scrolled = null;
+        let hidden = null;
         
-        window.addEventListener('scroll', () => {
-            const scrollY = window.scrollY;
-            const nav = document.querySelector('nav');
-            
-            if (nav) {
-                // Add scrolled class
-                if (scrollY > 100) {
-                    nav.classList.add('scrolled');
-                } else {
-                    nav.classList.remove('scrolled');
+        this.onScroll({
+            read: (scrollY) => {
+                const state = {
+                    // Add scrolled class
+                    scrolled: scrollY > $scrolled_after,
+                    // Hide/show nav based on scroll direction
+                    hidden: scrollY > lastScrollY && scrollY > $hide_after
+                };
+                lastScrollY = scrollY;
+                return state;
+            },
+            write: (state) => {
+                if (state.scrolled !== scrolled) {
+                    scrolled = state.scrolled;
+                    nav.classList.toggle('scrolled', scrolled);
                 }
-                
-                // Hide/show nav based on scroll direction
-                if (scrollY > lastScrollY && scrollY > 500) {
-                    nav.style.transform = 'translateY(-100%)';
-                } else {
-                    nav.style.transform = 'translateY(0)';
+                if (state.hidden !== hidden) {
+                    hidden = state.hidden;
+                    nav.style.transform = hidden ? 'translateY(-100%)' : 'translateY(0)';
                 }
             }
-            
-            lastScrollY = scrollY;
         });
     }
-    
-    // Animated counters
+"""),
+    'counters': ('setupCounterAnimations', """    // Animated counters
     setupCounterAnimations() {
-        const counters = document.querySelectorAll('.counter');
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const target = entry.target;
-                    const finalValue = parseInt(target.dataset.count) || 100;
-                    
-                    target.classList.add('animate');
-                    
-                    let current = 0;
-                    const increment = finalValue / 50;
-                    const timer = setInterval(() => {
-                        current += increment;
-                        if (current >= finalValue) {
-                            current = finalValue;
-                            clearInterval(timer);
-                        }
-                        target.textContent = Math.floor(current);
-                    }, 40);
-                    
-                    observer.unobserve(target);
-                }
+        this.observe(document.querySelectorAll('.counter'), (entry) => {
+            const target = entry.target;
+            const finalValue = parseInt(target.dataset.count) || 100;
+            
+            target.classList.add('animate');
+            this.animate($count_duration, (progress) => {
+                target.textContent = Math.floor(finalValue * progress);
             });
         });
-        
-        counters.forEach(counter => observer.observe(counter));
     }
-    
-    // Parallax scrolling
+"""),
+    'parallax': ('setupParallaxEffects', """    // Parallax scrolling, only for elements inside the viewport
     setupParallaxEffects() {
         const parallaxElements = document.querySelectorAll('.parallax-element');
-        
-        if (parallaxElements.length > 0) {
-            window.addEventListener('scroll', () => {
-                const scrolled = window.pageYOffset;
-                
-                parallaxElements.forEach(element => {
-                    const rate = scrolled * (element.dataset.rate || -0.5);
-                    element.style.transform = `translateY(${rate}px)`;
-                });
-            });
+        if (parallaxElements.length === 0) {
+            return;
         }
+        
+        const visible = new Set();
+        this.observe(parallaxElements, (entry) => {
+            if (entry.isIntersecting) {
+                visible.add(entry.target);
+            } else {
+                visible.delete(entry.target);
+            }
+        }, { once: false });
+        
+        this.onScroll({
+            read: (scrollY) => Array.from(visible, element =>
+                [element, scrollY * (element.dataset.rate || $rate)]),
+            write: (offsets) => offsets.forEach(([element, offset]) => {
+                element.style.transform = `translateY($${offset}px)`;
+            })
+        });
     }
-    
-    // Progress bar animations
+"""),
+    'progress': ('setupProgressBars', """    // Progress bar animations
     setupProgressBars() {
-        const progressBars = document.querySelectorAll('.progress-fill');
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const progressFill = entry.target;
-                    const percentage = progressFill.dataset.percentage || '100';
-                    
-                    progressFill.style.width = percentage + '%';
-                    progressFill.classList.add('animate');
-                    
-                    observer.unobserve(progressFill);
-                }
-            });
+        this.observe(document.querySelectorAll('.progress-fill'), (entry) => {
+            const progressFill = entry.target;
+            const percentage = progressFill.dataset.percentage || '100';
+            
+            progressFill.style.width = percentage + '%';
+            progressFill.classList.add('animate');
         });
-        
-        progressBars.forEach(bar => observer.observe(bar));
     }
-    
-    // Typewriter effect
+"""),
+    'typewriter': ('setupTypewriterEffect', """    // Typewriter effect
     setupTypewriterEffect() {
-        const typewriterElements = document.querySelectorAll('.typewriter');
-        
-        typewriterElements.forEach(element => {
+        document.querySelectorAll('.typewriter').forEach(element => {
             const text = element.textContent;
             element.textContent = '';
             element.style.width = '0';
             
-            const observer = new IntersectionObserver((entries) => {
-                entries.forEach(entry => {
-                    if (entry.isIntersecting) {
-                        this.typeText(element, text);
-                        observer.unobserve(element);
-                    }
-                });
-            });
-            
-            observer.observe(element);
+            this.observe([element], () => this.typeText(element, text));
         });
     }
     
     typeText(element, text) {
-        let index = 0;
-        const speed = 100;
-        
-        function type() {
-            if (index < text.length) {
-                element.textContent += text.charAt(index);
-                index++;
-                setTimeout(type, speed);
-            }
-        }
-        
-        // Animate width
+        // Animate width, then one character every $speed ms
         element.style.width = '100%';
-        setTimeout(type, 500);
+        this.animate(text.length * $speed, (progress) => {
+            element.textContent = text.slice(0, Math.ceil(text.length * progress));
+        }, $start_delay);
     }
-    
-    // Image reveal effect
+"""),
+    'image-reveal': ('setupImageReveal', """    // Image reveal effect
     setupImageReveal() {
-        const imageElements = document.querySelectorAll('.image-reveal');
-        const observer = new IntersectionObserver((entries) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    entry.target.classList.add('animate');
-                    observer.unobserve(entry.target);
-                }
-            });
+        this.observe(document.querySelectorAll('.image-reveal'), (entry) => {
+            entry.target.classList.add('animate');
         });
-        
-        imageElements.forEach(img => observer.observe(img));
     }
-    
-    // Smooth scroll to sections
+"""),
+    'scroll-to': (None, """    // Smooth scroll to sections
     static smoothScrollTo(targetId) {
         const target = document.getElementById(targetId);
         if (target) {
-            const offsetTop = target.offsetTop - 80;
+            const offsetTop = target.offsetTop - $offset;
             window.scrollTo({
                 top: offsetTop,
                 behavior: 'smooth'
             });
         }
     }
-    
-    // Loading animation
+"""),
+    'loading': (None, """    // Loading animation
     static showLoading() {
         const loader = document.createElement('div');
         loader.className = 'loading-spinner';
@@ -642,18 +858,17 @@ class AnimationController {
             loader.remove();
         }
     }
+"""),
 }
 
-// Initialize animations when DOM is loaded
-document.addEventListener('DOMContentLoaded', () => {
-    new AnimationController();
-});
-
+# Snippets that follow the controller
+JS_SNIPPETS = {
+    'utils': """
 // Utility functions for manual animation triggering
 window.AnimationUtils = {
     fadeIn: (element, duration = 500) => {
         element.style.opacity = '0';
-        element.style.transition = `opacity ${duration}ms ease`;
+        element.style.transition = `opacity $${duration}ms ease`;
         
         setTimeout(() => {
             element.style.opacity = '1';
@@ -662,7 +877,7 @@ window.AnimationUtils = {
     
     slideInFromLeft: (element, duration = 500) => {
         element.style.transform = 'translateX(-100%)';
-        element.style.transition = `transform ${duration}ms cubic-bezier(0.25, 0.46, 0.45, 0.94)`;
+        element.style.transition = `transform $${duration}ms $smooth`;
         
         setTimeout(() => {
             element.style.transform = 'translateX(0)';
@@ -671,72 +886,254 @@ window.AnimationUtils = {
     
     bounceIn: (element, duration = 600) => {
         element.style.transform = 'scale(0)';
-        element.style.transition = `transform ${duration}ms cubic-bezier(0.68, -0.55, 0.265, 1.55)`;
+        element.style.transition = `transform $${duration}ms $bounce`;
         
         setTimeout(() => {
             element.style.transform = 'scale(1)';
         }, 10);
     }
 };
-
+""",
+    'will-change': """
 // Performance optimization
 if ('requestIdleCallback' in window) {
     requestIdleCallback(() => {
         // Preload critical animations
-        const criticalElements = document.querySelectorAll('.hero, nav, .cta-button');
+        const criticalElements = document.querySelectorAll('$targets');
         criticalElements.forEach(el => {
             el.style.willChange = 'transform, opacity';
         });
     });
 }
+""",
+}
+
+STAGGER_JS = """            
+            // Handle staggered items
+            if (entry.target.classList.contains('stagger-container')) {
+                const items = entry.target.querySelectorAll('.stagger-item');
+                items.forEach((item, index) => {
+                    this.animate(0, () => item.classList.add('visible'), index * $step_ms);
+                });
+            }
+"""
+
+CSS_HEADER = """
+/* ========================================
+   ADVANCED ANIMATIONS & INTERACTIONS
+   Philip Wright Professional Portfolio
+   ======================================== */
 """
+
+JS_HEADER = """
+/* ========================================
+   ADVANCED ANIMATION CONTROLLERS
+   Philip Wright Professional Portfolio
+   ======================================== */
+"""
+
+def parse_seconds(value):
+    """'0.2s' or '200ms' -> 0.2"""
+    value = str(value).strip()
+    if value.endswith('ms'):
+        return float(value[:-2]) / 1000
+    return float(value.rstrip('s'))
+
+def format_seconds(seconds):
+    return f"{round(seconds, 3):g}s"
+
+def load_spec(path):
+    """The spec at path (JSON, or TOML where tomllib exists); None when absent"""
+    if not os.path.exists(path):
+        return None
+    if path.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError(f"{path}: TOML specs need Python 3.11+ (tomllib)")
+        with open(path, 'rb') as file:
+            return tomllib.load(file)
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def resolve_spec(spec):
+    """Validate a spec and fill in defaults.
     
-    # Write the animation JavaScript file
-    with open('animations.js', 'w', encoding='utf-8') as file:
-        file.write(animation_js)
+    Returns (features, keyframes, settings): the selected features in
+    catalogue order with their parameters, the keyframes to emit and the
+    global easings, breakpoints, observer options and index.html classes.
+    A missing spec selects every feature.
+    """
+    spec = spec or {'features': {name: {} for name in FEATURES}, 'classes': DEFAULT_CLASSES}
+    unknown = set(spec) - {'css', 'js', 'easings', 'breakpoints', 'observer', 'keyframes',
+                           'classes', 'features'}
+    if unknown:
+        raise ValueError(f"unknown spec keys: {', '.join(sorted(unknown))}")
+    easings = dict(EASINGS, **spec.get('easings', {}))
+    settings = {
+        'easings': easings,
+        'breakpoints': dict(BREAKPOINTS, **spec.get('breakpoints', {})),
+        'observer': dict(OBSERVER, **spec.get('observer', {})),
+        'classes': spec.get('classes', {}),
+    }
     
-    print("✅ Created advanced animation JavaScript file")
+    selected = spec.get('features', {})
+    unknown = [name for name in selected if name not in FEATURES]
+    if unknown:
+        raise ValueError(f"unknown animation features: {', '.join(sorted(unknown))}")
+    features = {}
+    for name, feature in FEATURES.items():
+        if name not in selected:
+            continue
+        overrides = selected[name] or {}
+        unknown = set(overrides) - set(feature['params'])
+        if unknown:
+            raise ValueError(f"{name}: unknown parameters: {', '.join(sorted(unknown))}")
+        params = dict(feature['params'], **overrides)
+        if 'easing' in params:
+            params['easing'] = easings.get(params['easing'], params['easing'])
+        features[name] = params
     
-    # Update index.html to include new files
-    with open('index.html', 'r', encoding='utf-8') as file:
-        content = file.read()
+    keyframes = set(spec.get('keyframes', []))
+    unknown = keyframes - set(KEYFRAMES)
+    if unknown:
+        raise ValueError(f"unknown keyframes: {', '.join(sorted(unknown))}")
+    for name in features:
+        keyframes.update(FEATURES[name].get('keyframes', ()))
+    return features, [name for name in KEYFRAMES if name in keyframes], settings
+
+def _render_css(template, params, features):
+    if callable(template):
+        return template(params, features)
+    return Template(template).substitute(params)
+
+def generate_css(features, keyframes, settings):
+    """animations.css for the resolved spec"""
+    sections = [CSS_HEADER]
+    if 'smooth-scroll' in features:
+        sections.append(FEATURES['smooth-scroll']['css'])
+    if keyframes:
+        sections.append("/* Keyframes */\n" + "\n".join(KEYFRAMES[name] for name in keyframes))
+    regular = [name for name in features
+               if name != 'smooth-scroll' and name not in ACCESSIBILITY_FEATURES]
+    for name in regular:
+        if 'css' in FEATURES[name]:
+            sections.append(_render_css(FEATURES[name]['css'], features[name], features))
     
-    # Add animation CSS link
-    if 'animations.css' not in content:
-        css_link = '    <link rel="stylesheet" href="animations.css">\n'
-        content = content.replace('<link rel="stylesheet" href="styles.css">', 
-                                '<link rel="stylesheet" href="styles.css">\n' + css_link)
+    mobile = [Template(FEATURES[name]['mobile']).substitute(features[name])
+              for name in regular if 'mobile' in FEATURES[name]]
+    if mobile:
+        sections.append(f"/* Responsive animations */\n"
+                        f"@media (max-width: {settings['breakpoints']['mobile']}) {{\n"
+                        + "    \n".join(mobile) + "}\n")
     
-    # Add animation JS script
-    if 'animations.js' not in content:
-        js_script = '    <script src="animations.js"></script>\n'
-        content = content.replace('<script src="script.js"></script>', 
-                                '<script src="script.js"></script>\n' + js_script)
+    for name in ACCESSIBILITY_FEATURES:
+        if name in features:
+            sections.append(_render_css(FEATURES[name]['css'], features[name], features))
+    return "\n".join(section for section in sections if section)
+
+def _module_params(module, features, settings):
+    """Substitutions for a controller module, from the features needing it"""
+    if module == 'scroll':
+        selectors = []
+        if 'scroll-reveal' in features:
+            selectors.append('.animate-on-scroll')
+        stagger = ''
+        if 'stagger' in features:
+            selectors.append('.stagger-container')
+            step_ms = round(parse_seconds(features['stagger']['step']) * 1000)
+            stagger = Template(STAGGER_JS).substitute(step_ms=step_ms)
+        return {'selectors': ', '.join(selectors), 'stagger': stagger,
+                'threshold': settings['observer']['threshold'],
+                'root_margin': settings['observer']['root_margin']}
+    owner = next(name for name in features if module in FEATURES[name].get('js', ()))
+    params = dict(features[owner])
+    if 'targets' in params:
+        params['targets'] = ', '.join(params['targets'])
+    return params
+
+def generate_js(features, settings):
+    """animations.js for the resolved spec"""
+    modules = []
+    for name in features:
+        for module in FEATURES[name].get('js', ()):
+            if module not in modules:
+                modules.append(module)
+    
+    methods = [m for m in JS_MODULES if m in modules]
+    setups = [JS_MODULES[m][0] for m in methods if JS_MODULES[m][0]]
+    init = ''.join(f"        this.{setup}();\n" for setup in setups)
+    body = "    \n".join(Template(JS_MODULES[m][1]).substitute(_module_params(m, features, settings))
+                         for m in methods)
+    js = JS_HEADER + f"""
+class AnimationController {{
+    constructor() {{
+        this.init();
+    }}
     
-    # Add animation classes to key elements
-    content = content.replace('<section class="hero">', '<section class="hero animate-on-scroll">')
-    content = content.replace('<section class="about">', '<section class="about animate-on-scroll">')
-    content = content.replace('<section class="work">', '<section class="work animate-on-scroll stagger-container">')
-    content = content.replace('<section class="contact">', '<section class="contact animate-on-scroll">')
+    init() {{
+{init}    }}
+""" + (f"    \n{body}" if body else "") + """}
+
+// Initialize animations when DOM is loaded
+document.addEventListener('DOMContentLoaded', () => {
+    new AnimationController();
+});
+"""
+    for snippet in JS_SNIPPETS:
+        if snippet in modules:
+            params = dict(_module_params(snippet, features, settings), **settings['easings'])
+            js += Template(JS_SNIPPETS[snippet]).substitute(params)
+    return js
+
+def create_advanced_animations(spec=None):
+    """Generate animations.css and animations.js for a spec"""
+    features, keyframes, settings = resolve_spec(spec)
+    css_file = (spec or {}).get('css', 'animations.css')
+    js_file = (spec or {}).get('js', 'animations.js')
     
-    # Add stagger-item class to work cards
-    content = content.replace('<div class="work-card">', '<div class="work-card stagger-item">')
+    # Write the animations CSS file
+    if write_if_changed(css_file, generate_css(features, keyframes, settings)):
+        print(f"✅ Created {css_file}: {len(features)} features, {len(keyframes)} keyframes")
+    else:
+        print(f"✅ {css_file} already up to date")
     
-    # Write updated HTML
-    with open('index.html', 'w', encoding='utf-8') as file:
-        file.write(content)
+    # Write the animation JavaScript file
+    if write_if_changed(js_file, generate_js(features, settings)):
+        print(f"✅ Created {js_file}")
+    else:
+        print(f"✅ {js_file} already up to date")
     
-    print("✅ Updated index.html with animation integration")
-
-def create_css_guidelines():
+    # Link the files from index.html and add the classes the spec asks for,
+    # in one parse; a document that already has them is left untouched
+    injections = [('head', f'<link rel="stylesheet" href="{css_file}">'),
+                  ('body', f'<script src="{js_file}"></script>')]
+    if rewrite_html_file(HTML_FILE, settings['classes'].items(), injections):
+        print(f"✅ Updated {HTML_FILE} with animation integration")
+    else:
+        print(f"✅ {HTML_FILE} already integrated")
+
+def create_css_guidelines(spec=None, spec_file=SPEC_FILE):
     """Create CSS animation usage guidelines"""
     
+    features, keyframes, settings = resolve_spec(spec)
+    selected = "\n".join(f"- `{name}` - {FEATURES[name]['description']}" for name in features)
+    available = "\n".join(f"- `{name}` - {feature['description']}"
+                          for name, feature in FEATURES.items() if name not in features)
+    
     guidelines = """
 # 🎨 Advanced Animation System Guide
 
 ## Files Created:
-- `animations.css` - All CSS animations and transitions
-- `animations.js` - JavaScript animation controllers
+- `animations.css` - CSS animations and transitions for the selected features
+- `animations.js` - JavaScript animation controllers for the selected features
+
+Both are generated from `""" + spec_file + """` - edit the spec and rerun
+`python3 create-animations.py` rather than editing them by hand.
+
+## Selected Features:
+""" + (selected or "- (none)") + """
+
+## Other Available Features:
+""" + (available or "- (none)") + """
 
 ## Available Animation Classes:
 
@@ -834,30 +1231,54 @@ AnimationController.hideLoading(loader);
 ✅ Mobile optimized  
 
 ## Customization:
-Edit `animations.css` to modify:
-- Animation durations
-- Easing functions  
-- Color schemes
-- Responsive breakpoints
-
-Edit `animations.js` to modify:
-- Animation triggers
-- Scroll thresholds
-- Counter speeds
-- Parallax rates
+Edit `""" + spec_file + """` to modify:
+- Which features are generated (`features`, keyed by the names above)
+- Animation durations and delays (per-feature parameters)
+- Easing functions (`easings`, referenced by name)
+- Responsive breakpoints (`breakpoints`)
+- Scroll thresholds (`observer`)
+- Extra keyframes for the site's own styles (`keyframes`)
+- Classes added to index.html elements, by CSS selector (`classes`)
+
+```json
+{
+    "easings": {"smooth": "cubic-bezier(0.25, 0.46, 0.45, 0.94)"},
+    "breakpoints": {"mobile": "768px"},
+    "features": {
+        "card-lift": {"duration": "0.3s", "easing": "smooth", "lift": "-6px"},
+        "counter": {"count_duration": 3000}
+    },
+    "classes": {"section#work": ["stagger-container"]}
+}
+```
+
+Only the listed features are emitted; an unlisted feature costs nothing.
+Without a spec file every feature is generated with its defaults.
 """
     
-    with open('ANIMATION-GUIDE.md', 'w', encoding='utf-8') as file:
-        file.write(guidelines)
-    
-    print("✅ Created animation usage guide")
+    if write_if_changed('ANIMATION-GUIDE.md', guidelines):
+        print("✅ Created animation usage guide")
+    else:
+        print("✅ Animation usage guide already up to date")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate animations.css and animations.js from a spec")
+    parser.add_argument('--spec', default=SPEC_FILE, metavar='FILE',
+                        help=f"animation spec, JSON or TOML (default: {SPEC_FILE}; all features if absent)")
+    args = parser.parse_args()
+    
     print("🎭 Philip Wright Advanced Animation System")
     print("=" * 45)
     
-    create_advanced_animations()
-    create_css_guidelines()
+    try:
+        spec = load_spec(args.spec)
+        if spec is None:
+            print(f"⚠️  {args.spec} not found, generating every feature")
+        create_advanced_animations(spec)
+        create_css_guidelines(spec, args.spec)
+    except (ValueError, OSError) as error:
+        print(f"❌ {args.spec}: {error}")
+        sys.exit(1)
     
     print("\n🎉 Advanced animation system complete!")
     print("📚 Check ANIMATION-GUIDE.md for usage instructions")
@@ -64,7 +64,8 @@ deploy_netlify() {
     # Create netlify.toml for configuration
     cat > netlify.toml << EOF
 [build]
-  publish = "."
+  command = "python3 optimize.py"
+  publish = "dist"
 
 [build.environment]
   NODE_VERSION = "18"
@@ -77,15 +78,27 @@ deploy_netlify() {
     X-Content-Type-Options = "nosniff"
     Referrer-Policy = "strict-origin-when-cross-origin"
 
+# Every CSS/JS file in dist/ is fingerprinted: a change gets a new name
 [[headers]]
   for = "*.js"
   [headers.values]
-    Cache-Control = "public, max-age=604800"
+    Cache-Control = "public, max-age=31536000, immutable"
 
 [[headers]]
   for = "*.css"
   [headers.values]
-    Cache-Control = "public, max-age=604800"
+    Cache-Control = "public, max-age=31536000, immutable"
+
+# Pages and other unhashed files keep their names, so they revalidate
+[[headers]]
+  for = "/"
+  [headers.values]
+    Cache-Control = "public, max-age=0, must-revalidate"
+
+[[headers]]
+  for = "*.html"
+  [headers.values]
+    Cache-Control = "public, max-age=0, must-revalidate"
 
 [[redirects]]
   from = "/*"
@@ -96,7 +109,7 @@ EOF
     echo -e "${GREEN}✅ Created netlify.toml configuration${NC}"
     echo -e "${YELLOW}📋 Manual steps:${NC}"
     echo -e "   1. Go to https://app.netlify.com/"
-    echo -e "   2. Drag and drop this entire folder"
+    echo -e "   2. Run python3 optimize.py, then drag and drop the dist/ folder"
     echo -e "   3. Your site will be live instantly!"
 }
 
@@ -1 +0,0 @@
-document.addEventListener('DOMContentLoaded',function(){const hamburger=document.querySelector('.hamburger');const navMenu=document.querySelector('.nav-menu');const navLinks=document.querySelectorAll('.nav-menu li a');hamburger.addEventListener('click',function(){hamburger.classList.toggle('active');navMenu.classList.toggle('active');const spans=hamburger.querySelectorAll('span');if(hamburger.classList.contains('active')){spans[0].style.transform='rotate(-45deg)translate(-5px,6px)';spans[1].style.opacity='0';spans[2].style.transform='rotate(45deg)translate(-5px,-6px)';}else{spans[0].style.transform='rotate(0)translate(0,0)';spans[1].style.opacity='1';spans[2].style.transform='rotate(0)translate(0,0)';}});navLinks.forEach(link=>{link.addEventListener('click',function(){hamburger.classList.remove('active');navMenu.classList.remove('active');const spans=hamburger.querySelectorAll('span');spans[0].style.transform='rotate(0)translate(0,0)';spans[1].style.opacity='1';spans[2].style.transform='rotate(0)translate(0,0)';});});document.addEventListener('click',function(event){const isClickInsideNav=navMenu.contains(event.target);const isClickOnHamburger=hamburger.contains(event.target);if(!isClickInsideNav&&!isClickOnHamburger&&navMenu.classList.contains('active')){hamburger.classList.remove('active');navMenu.classList.remove('active');const spans=hamburger.querySelectorAll('span');spans[0].style.transform='rotate(0)translate(0,0)';spans[1].style.opacity='1';spans[2].style.transform='rotate(0)translate(0,0)';}});});document.querySelectorAll('a[href^="#"]').forEach(anchor=>{anchor.addEventListener('click',function(e){e.preventDefault();const target=document.querySelector(this.getAttribute('href'));if(target){const headerOffset=70;const elementPosition=target.getBoundingClientRect().top;const offsetPosition=elementPosition+window.pageYOffset-headerOffset;window.scrollTo({top: offsetPosition,behavior: 'smooth'});}});});window.addEventListener('scroll',function(){let current='';const sections=document.querySelectorAll('section');sections.forEach(section=>{const sectionTop=section.offsetTop;const sectionHeight=section.clientHeight;if(pageYOffset>=(sectionTop-200)){current=section.getAttribute('id');}});const navLinks=document.querySelectorAll('.nav-menu a');navLinks.forEach(link=>{link.classList.remove('active');if(link.getAttribute('href')==='#'+current){link.classList.add('active');}});});window.addEventListener('scroll',function(){const header=document.querySelector('header');if(window.scrollY>100){header.style.background='rgba(255,255,255,0.98)';header.style.boxShadow='0 2px 30px rgba(0,0,0,0.15)';}else{header.style.background='rgba(255,255,255,0.95)';header.style.boxShadow='0 2px 20px rgba(0,0,0,0.1)';}});const observerOptions={threshold: 0.1,rootMargin: '0px 0px-50px 0px'};const observer=new IntersectionObserver(function(entries){entries.forEach(entry=>{if(entry.isIntersecting){entry.target.classList.add('animate-in');}});},observerOptions);document.addEventListener('DOMContentLoaded',function(){const elementsToAnimate=document.querySelectorAll('.project-card,.about-text,.contact-content');elementsToAnimate.forEach(element=>{observer.observe(element);});});const style=document.createElement('style');style.textContent=` .project-card,.about-text,.contact-content{opacity: 0;transform: translateY(30px);transition: opacity 0.8s ease,transform 0.8s ease;}.project-card.animate-in,.about-text.animate-in,.contact-content.animate-in{opacity: 1;transform: translateY(0);}.nav-menu a.active{color: #3498db;}.nav-menu a.active::after{width: 100%;}`;document.head.appendChild(style);function handleFormSubmit(event){event.preventDefault();alert('Thank you for your message!I\'ll get back to you soon.');}document.addEventListener('click',function(event){if(event.target.href&&event.target.href.startsWith('mailto:')){console.log('Email link clicked');}});document.addEventListener('keydown',function(event){if(event.key==='Escape'){const navMenu=document.querySelector('.nav-menu');const hamburger=document.querySelector('.hamburger');if(navMenu.classList.contains('active')){hamburger.classList.remove('active');navMenu.classList.remove('active');const spans=hamburger.querySelectorAll('span');spans[0].style.transform='rotate(0)translate(0,0)';spans[1].style.opacity='1';spans[2].style.transform='rotate(0)translate(0,0)';}}});
\ No newline at end of file
@@ -1,41 +1,1242 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server to test the Philip Wright website locally.
-Run with: python3 serve.py
+Run with: python3 serve.py [--dev | --watch] [--host HOST] [--port PORT] [--workers N]
 Then visit: http://localhost:8000
 """
 
 import http.server
-import socketserver
+import urllib.parse
+import email.utils
 import webbrowser
+import threading
+import datetime
+import hashlib
+import functools
+import argparse
+import bisect
+import ctypes
+import struct
+import queue
+import json
+import time
+import shutil
+import secrets
+import selectors
+import socket
+import stat as stat_module
+import gzip
+import io
 import os
+import re
 import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 PORT = 8000
 
+# Requests are handled on a bounded pool of workers. Between requests a
+# keep-alive connection waits in a selector, costing a file descriptor
+# rather than a worker, and is closed after KEEPALIVE_TIMEOUT idle
+# seconds; the number of open connections is bounded by the process's
+# file descriptor limit (ulimit -n), not by the pool.
+DEFAULT_WORKERS = 64
+KEEPALIVE_TIMEOUT = 5
+# Seconds a started request may stall between reads, and a response
+# between writes, so slow or paused downloads are not cut off
+READ_TIMEOUT = 10
+WRITE_TIMEOUT = 60
+
+# Precompressed siblings written by optimize.py, in order of preference
+ENCODING_SIBLINGS = (('br', '.br'), ('zstd', '.zst'), ('gzip', '.gz'))
+
+# Types gzipped on the fly when no sibling exists, into a bounded cache
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/javascript', 'application/json',
+    'application/manifest+json', 'application/xml', 'image/svg+xml',
+)
+MIN_COMPRESS_SIZE = 256
+COMPRESSION_CACHE_BYTES = 16 * 1024 * 1024
+
+# Files at least this large go out through sendfile(2), skipping the
+# userspace copy; smaller ones are cheaper to write in one go
+SENDFILE_THRESHOLD = 64 * 1024
+
+# More ranges than this in one request are served as a plain 200
+MAX_RANGES = 32
+
+class LRUCache:
+    """Thread-safe mapping that evicts least recently used entries past a byte budget"""
+    
+    def __init__(self, budget):
+        self.budget = budget
+        self.size = 0
+        self.entries = OrderedDict()    # key -> (value, size)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key, valid=None):
+        """Cached value, or None; a value failing valid(value) counts as a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is None or (valid is not None and not valid(entry[0])):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        return entry[0]
+    
+    def put(self, key, value, size):
+        with self.lock:
+            self.discard_locked(key)
+            if size > self.budget:
+                return
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+    
+    def discard(self, key):
+        with self.lock:
+            self.discard_locked(key)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+    
+    def discard_locked(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+compression_cache = LRUCache(COMPRESSION_CACHE_BYTES)
+
+# Cache-Control outside --dev. optimize.py publishes CSS and JS under
+# content-hashed names (styles.3f9a1c2b.min.css), which never change.
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{8}\.min\.\w+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CACHE_CONTROL = {
+    '.html': 'no-cache',
+    '.css': 'public, max-age=3600',
+    '.js': 'public, max-age=3600',
+    '.png': 'public, max-age=2592000',
+    '.jpg': 'public, max-age=2592000',
+    '.jpeg': 'public, max-age=2592000',
+    '.webp': 'public, max-age=2592000',
+    '.avif': 'public, max-age=2592000',
+    '.svg': 'public, max-age=2592000',
+    '.ico': 'public, max-age=2592000',
+    '.mp4': 'public, max-age=2592000',
+    '.webm': 'public, max-age=2592000',
+    '.woff2': 'public, max-age=2592000',
+}
+DEFAULT_CACHE_CONTROL = 'public, max-age=3600'
+
+etag_cache = {}     # path -> ((mtime_ns, size), etag)
+etag_lock = threading.Lock()
+
+def cache_control(path):
+    if FINGERPRINTED.search(path):
+        return IMMUTABLE_CACHE_CONTROL
+    return CACHE_CONTROL.get(os.path.splitext(path)[1].lower(), DEFAULT_CACHE_CONTROL)
+
+def file_etag(path, stat):
+    """Strong ETag from the file's content hash, memoized by mtime and size"""
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with etag_lock:
+        cached = etag_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:20]}"'
+    with etag_lock:
+        etag_cache[path] = (stamp, etag)
+    return etag
+
+def representation_etag(path, stat, encoding, sent_path):
+    """ETag of what is sent: each encoding is a representation of its own"""
+    if sent_path is not None:
+        return file_etag(sent_path, stat if sent_path == path else os.stat(sent_path))
+    # On-the-fly gzip is deterministic, so it derives from the file's tag
+    return file_etag(path, stat)[:-1] + f'-{encoding}"'
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header"""
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip().lower() == 'q':
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+def parse_byte_ranges(header, length):
+    """Inclusive (start, end) pairs for a Range header, sorted and merged.
+    
+    Returns [] when no range is satisfiable and None when the header
+    should be ignored: other units, bad syntax or too many ranges.
+    """
+    units, _, specs = header.partition('=')
+    if units.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash or not (first or last):
+            return None
+        try:
+            if first:
+                start = int(first)
+                if last:
+                    end = int(last)
+                    if end < start:
+                        return None
+                else:
+                    end = length - 1
+            else:
+                start = length - int(last)
+                end = length - 1
+                if int(last) == 0:
+                    continue
+        except ValueError:
+            return None
+        start = max(start, 0)
+        if start < length:
+            ranges.append((start, min(end, length - 1)))
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged if len(merged) <= MAX_RANGES else None
+
+def accepts_encoding(codings, coding):
+    return codings.get(coding, codings.get('*', 0)) > 0
+
+def is_compressible(ctype):
+    return ctype.startswith(COMPRESSIBLE_TYPES)
+
+def gzip_on_the_fly(path, stat):
+    """Gzipped file contents, or None when gzip doesn't make it smaller"""
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = compression_cache.get((path, 'gzip'), lambda value: value[0] == stamp)
+    if cached is not None:
+        return cached[1]
+    with open(path, 'rb') as file:
+        data = file.read()
+    compressed = gzip.compress(data, compresslevel=6, mtime=0)
+    if len(compressed) >= len(data):
+        compressed = None
+    compression_cache.put((path, 'gzip'), (stamp, compressed), len(compressed or b''))
+    return compressed
+
+# Hot-file cache (--memory-cache): every representation of a file, with
+# its ETag and MIME type, kept in memory. Entries are dropped by inotify
+# events when available; otherwise each hit re-stats the file and its
+# siblings and reloads on any change.
+MAX_HOT_FILE_SIZE = 1024 * 1024
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+WATCH_EXCLUDE_DIRS = {'node_modules', '__pycache__'}
+
+def watch_inotify(root, callback):
+    """Call callback(path) from a thread for every change under root.
+    
+    Returns False when inotify is unavailable. callback(None) means events
+    were lost and everything should be considered changed.
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return False
+    if fd < 0:
+        return False
+    
+    watches = {}
+    def add_tree(top):
+        for dirpath, dirnames, _ in os.walk(top):
+            dirnames[:] = [d for d in dirnames
+                           if d not in WATCH_EXCLUDE_DIRS and not d.startswith('.')]
+            wd = libc.inotify_add_watch(fd, os.fsencode(dirpath), INOTIFY_MASK)
+            if wd >= 0:
+                watches[wd] = dirpath
+    
+    def run():
+        while True:
+            buffer = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = struct.unpack_from('iIII', buffer, offset)
+                name = buffer[offset + 16:offset + 16 + length].rstrip(b'\0')
+                offset += 16 + length
+                if mask & IN_Q_OVERFLOW:
+                    callback(None)
+                    continue
+                directory = watches.get(wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    add_tree(path)
+                callback(path)
+    
+    add_tree(root)
+    threading.Thread(target=run, name='inotify', daemon=True).start()
+    return True
+
+def file_stamps(path):
+    """(mtime_ns, size) of a file and each sibling, None for missing ones"""
+    stamps = []
+    for candidate in [path] + [path + ext for _, ext in ENCODING_SIBLINGS]:
+        try:
+            stat = os.stat(candidate)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+def load_hot_entry(path, ctype):
+    """Every representation of a file, or None when it doesn't belong in memory"""
+    stamps = file_stamps(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if not stat_module.S_ISREG(stat.st_mode) or stat.st_size > MAX_HOT_FILE_SIZE:
+        return None
+    with open(path, 'rb') as file:
+        data = file.read()
+    identity_etag = f'"{hashlib.sha256(data).hexdigest()[:20]}"'
+    variants = {None: (data, identity_etag)}
+    for (coding, ext), stamp in zip(ENCODING_SIBLINGS, stamps[1:]):
+        if stamp is not None and stamp[0] >= stamps[0][0]:
+            with open(path + ext, 'rb') as file:
+                encoded = file.read()
+            variants[coding] = (encoded, f'"{hashlib.sha256(encoded).hexdigest()[:20]}"')
+    if ('gzip' not in variants and is_compressible(ctype)
+            and len(data) >= MIN_COMPRESS_SIZE):
+        compressed = gzip.compress(data, compresslevel=6, mtime=0)
+        if len(compressed) < len(data):
+            variants['gzip'] = (compressed, identity_etag[:-1] + '-gzip"')
+    return {
+        'stamps': stamps,
+        'ctype': ctype,
+        'mtime': stat.st_mtime,
+        'variants': variants,
+        'size': sum(len(body) for body, _ in variants.values()),
+    }
+
+def invalidate_hot_file(cache, path):
+    """inotify callback: forget a changed file, or the file a sibling belongs to"""
+    if path is None:
+        cache.clear()
+        return
+    cache.discard(path)
+    for _, ext in ENCODING_SIBLINGS:
+        if path.endswith(ext):
+            cache.discard(path[:-len(ext)])
+
+# Live reload (--watch): source changes go through optimize.py's
+# incremental pipeline in the background and are pushed to open pages over
+# Server-Sent Events. Stylesheet-only changes swap <link> hrefs in place;
+# anything else reloads the page.
+RELOAD_ENDPOINT = '/__reload'
+WATCH_DEBOUNCE = 0.02
+WATCH_POLL_INTERVAL = 0.1
+SSE_HEARTBEAT = 15
+
+LIVE_RELOAD_SCRIPT = '''<script>
+(function () {
+    var source = new EventSource('%s');
+    source.onmessage = function (event) {
+        var message = JSON.parse(event.data);
+        if (message.type !== 'css') {
+            location.reload();
+            return;
+        }
+        var links = document.querySelectorAll('link[rel="stylesheet"], link[rel="preload"][as="style"]');
+        message.stylesheets.forEach(function (sheet) {
+            var name = sheet.source.split('/').pop();
+            var stem = name.replace(/\\.css$/, '').replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+            var built = new RegExp('^' + stem + '(\\\\.[0-9a-f]{8})?\\\\.min\\\\.css$');
+            links.forEach(function (link) {
+                var url = new URL(link.href);
+                var current = url.pathname.split('/').pop();
+                if (current === name) {
+                    url.search = '?t=' + Date.now();
+                } else if (built.test(current)) {
+                    url.pathname = url.pathname.slice(0, -current.length) + sheet.published.split('/').pop();
+                } else {
+                    return;
+                }
+                link.href = url.href;
+            });
+        });
+    };
+})();
+</script>
+''' % RELOAD_ENDPOINT
+
+class LiveReload:
+    """Rebuilds changed sources and notifies subscribed pages"""
+    
+    def __init__(self, root):
+        self.root = root
+        self.clients = set()
+        self.pending = set()
+        self.changed = threading.Event()
+        self.lock = threading.Lock()
+    
+    def start(self):
+        """Start watching; returns the mechanism used"""
+        import optimize
+        self.optimize = optimize
+        threading.Thread(target=self.build_loop, name='live-reload', daemon=True).start()
+        if watch_inotify(self.root, self.on_change):
+            return 'inotify'
+        threading.Thread(target=self.poll_loop, name='watch-poll', daemon=True).start()
+        return 'polling'
+    
+    def on_change(self, path):
+        if path is None:
+            sources = self.optimize.discover_assets(self.root)
+        else:
+            sources = [os.path.relpath(path, self.root)]
+        sources = [s for s in sources if self.optimize.is_source_asset(s)]
+        if sources:
+            with self.lock:
+                self.pending.update(sources)
+            self.changed.set()
+    
+    def poll_loop(self):
+        stamps = None
+        while True:
+            current = {}
+            for source in self.optimize.discover_assets(self.root):
+                try:
+                    stat = os.stat(os.path.join(self.root, source))
+                except OSError:
+                    continue
+                current[source] = (stat.st_mtime_ns, stat.st_size)
+            if stamps is not None:
+                for source in set(current) ^ set(stamps) | {
+                        s for s in current if s in stamps and current[s] != stamps[s]}:
+                    self.on_change(os.path.join(self.root, source))
+            stamps = current
+            time.sleep(WATCH_POLL_INTERVAL)
+    
+    def build_loop(self):
+        while True:
+            self.changed.wait()
+            # Editors save in several writes; take them as one change
+            time.sleep(WATCH_DEBOUNCE)
+            with self.lock:
+                changed, self.pending = self.pending, set()
+                self.changed.clear()
+            start = time.perf_counter()
+            try:
+                results = self.optimize.rebuild_assets()
+            except Exception as error:
+                print(f"❌ Rebuild failed: {error}")
+                continue
+            self.broadcast(self.message(changed, results))
+            milliseconds = (time.perf_counter() - start) * 1000
+            print(f"♻️  Rebuilt {', '.join(sorted(changed))} in {milliseconds:.0f} ms")
+    
+    def message(self, changed, results):
+        if not all(source.endswith('.css') for source in changed):
+            return {'type': 'reload'}
+        published = {r['source']: r['fingerprinted'] or r['target'] for r in results}
+        return {'type': 'css', 'stylesheets': [
+            {'source': source, 'published': published.get(source, source)}
+            for source in sorted(changed)
+        ]}
+    
+    def subscribe(self):
+        client = queue.SimpleQueue()
+        with self.lock:
+            self.clients.add(client)
+        return client
+    
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+    
+    def broadcast(self, message):
+        data = json.dumps(message)
+        with self.lock:
+            for client in self.clients:
+                client.put(data)
+
+def inject_live_reload(data):
+    """Add the live-reload client before </body>"""
+    script = LIVE_RELOAD_SCRIPT.encode('utf-8')
+    index = data.lower().rfind(b'</body>')
+    if index < 0:
+        return data + script
+    return data[:index] + script + data[index:]
+
+# Observability: a structured access log written in batches, and request
+# metrics served at /__metrics in the Prometheus text format.
+METRICS_ENDPOINT = '/__metrics'
+ACCESS_LOG_FLUSH_INTERVAL = 1.0
+ACCESS_LOG_BUFFER_LINES = 512
+MAX_METRIC_PATHS = 500
+OTHER_PATHS = '(other)'
+
+# Latency buckets from 10 microseconds to 80 s, at most 25% apart, so percentiles
+# interpolated within a bucket land close to the real value
+_LATENCY_STEPS = [(mantissa, exponent) for exponent in range(-5, 2)
+                  for mantissa in (1, 1.25, 1.5, 2, 2.5, 3, 4, 5, 6, 8)]
+LATENCY_BOUNDS = tuple(mantissa * 10.0 ** exponent for mantissa, exponent in _LATENCY_STEPS)
+# The subset exported as histogram buckets: 1-2.5-5 steps from 0.1 ms to 10 s
+HISTOGRAM_BOUNDS = tuple(index for index, (mantissa, exponent) in enumerate(_LATENCY_STEPS)
+                         if mantissa in (1, 2.5, 5) and 1e-4 <= LATENCY_BOUNDS[index] <= 10)
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+class AccessLog:
+    """JSON-lines access log, buffered and written by a background thread"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.records = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closed = False
+        self.thread = threading.Thread(target=self.flush_loop, name='access-log', daemon=True)
+        self.thread.start()
+    
+    def write(self, record):
+        with self.lock:
+            self.records.append(record)
+            full = len(self.records) >= ACCESS_LOG_BUFFER_LINES
+        if full:
+            self.wake.set()
+    
+    def flush(self):
+        with self.lock:
+            records, self.records = self.records, []
+        if records:
+            # One write per batch instead of one per request
+            self.stream.write(''.join(json.dumps(record, separators=(',', ':')) + '\n'
+                                      for record in records))
+            self.stream.flush()
+    
+    def flush_loop(self):
+        while not self.closed:
+            self.wake.wait(ACCESS_LOG_FLUSH_INTERVAL)
+            self.wake.clear()
+            self.flush()
+    
+    def close(self):
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+
+class LatencyHistogram:
+    """Request durations counted into LATENCY_BOUNDS"""
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+    
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+    
+    def quantile(self, q):
+        """Estimate, interpolating linearly inside the bucket holding the rank"""
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BOUNDS[index - 1] if index else 0.0
+                upper = LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else self.max
+                # The observed extremes are tighter bounds than the edge buckets
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return 0.0
+
+def metric_labels(**labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+class Metrics:
+    """Request counters, latency histograms and bytes sent, per path"""
+    
+    def __init__(self):
+        self.started = time.time()
+        self.requests = {}      # (path, method, status) -> count
+        self.latency = {}       # path -> LatencyHistogram
+        self.bytes_sent = {}    # encoding -> bytes
+        self.lock = threading.Lock()
+    
+    def observe(self, path, method, status, seconds, encoding, length):
+        with self.lock:
+            # Error responses and paths past the limit share one series, so
+            # scanners probing random URLs can't grow the metrics unbounded
+            if status >= 400 or (path not in self.latency
+                                 and len(self.latency) >= MAX_METRIC_PATHS):
+                path = OTHER_PATHS
+            key = (path, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get(path)
+            if histogram is None:
+                histogram = self.latency[path] = LatencyHistogram()
+            histogram.observe(seconds)
+            encoding = encoding or 'identity'
+            self.bytes_sent[encoding] = self.bytes_sent.get(encoding, 0) + length
+    
+    def render(self, caches):
+        """Everything in the Prometheus text exposition format"""
+        lines = []
+        
+        def family(name, kind, description):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+        
+        with self.lock:
+            family('serve_uptime_seconds', 'gauge', 'Seconds since the server started.')
+            lines.append(f'serve_uptime_seconds {time.time() - self.started:.3f}')
+            
+            family('serve_requests_total', 'counter', 'Requests handled, by path, method and status.')
+            for (path, method, status), count in sorted(self.requests.items()):
+                labels = metric_labels(path=path, method=method, status=status)
+                lines.append(f'serve_requests_total{labels} {count}')
+            
+            family('serve_request_duration_seconds', 'histogram',
+                   'Time from parsing the request to flushing the response, by path.')
+            for path, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                counted = 0
+                for index in HISTOGRAM_BOUNDS:
+                    cumulative += sum(histogram.counts[counted:index + 1])
+                    counted = index + 1
+                    labels = metric_labels(path=path, le=f'{LATENCY_BOUNDS[index]:g}')
+                    lines.append(f'serve_request_duration_seconds_bucket{labels} {cumulative}')
+                labels = metric_labels(path=path, le='+Inf')
+                lines.append(f'serve_request_duration_seconds_bucket{labels} {histogram.count}')
+                labels = metric_labels(path=path)
+                lines.append(f'serve_request_duration_seconds_sum{labels} {histogram.sum:.6f}')
+                lines.append(f'serve_request_duration_seconds_count{labels} {histogram.count}')
+            
+            family('serve_request_latency_seconds', 'summary',
+                   'Request latency percentiles, by path.')
+            for path, histogram in sorted(self.latency.items()):
+                for q in LATENCY_QUANTILES:
+                    labels = metric_labels(path=path, quantile=q)
+                    lines.append(f'serve_request_latency_seconds{labels} {histogram.quantile(q):.6f}')
+                labels = metric_labels(path=path)
+                lines.append(f'serve_request_latency_seconds_sum{labels} {histogram.sum:.6f}')
+                lines.append(f'serve_request_latency_seconds_count{labels} {histogram.count}')
+            
+            family('serve_sent_bytes_total', 'counter', 'Response body bytes sent, by content coding.')
+            for encoding, length in sorted(self.bytes_sent.items()):
+                lines.append(f'serve_sent_bytes_total{metric_labels(encoding=encoding)} {length}')
+        
+        family('serve_cache_hits_total', 'counter', 'Cache lookups that found a current entry.')
+        counts = [(name, cache.hits, cache.misses) for name, cache in caches]
+        for name, hits, _ in counts:
+            lines.append(f'serve_cache_hits_total{metric_labels(cache=name)} {hits}')
+        family('serve_cache_misses_total', 'counter', 'Cache lookups that had to load or compute.')
+        for name, _, misses in counts:
+            lines.append(f'serve_cache_misses_total{metric_labels(cache=name)} {misses}')
+        family('serve_cache_hit_ratio', 'gauge', 'Hits over lookups since the server started.')
+        for name, hits, misses in counts:
+            ratio = hits / (hits + misses) if hits + misses else 0
+            lines.append(f'serve_cache_hit_ratio{metric_labels(cache=name)} {ratio:.4f}')
+        family('serve_cache_bytes', 'gauge', 'Bytes held in each cache.')
+        for name, cache in caches:
+            lines.append(f'serve_cache_bytes{metric_labels(cache=name)} {cache.size}')
+        return '\n'.join(lines) + '\n'
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = 'HTTP/1.1'
+    timeout = READ_TIMEOUT
+    # Headers and body go out in separate writes; with Nagle's algorithm the
+    # body waits for the client's delayed ACK of the headers (~40 ms)
+    disable_nagle_algorithm = True
+    extensions_map = {
+        **http.server.SimpleHTTPRequestHandler.extensions_map,
+        '.js': 'text/javascript',
+        '.webmanifest': 'application/manifest+json',
+    }
+    
+    def send_head(self):
+        """Serve regular files through content negotiation; everything else as before"""
+        self.body_parts = None      # byte ranges to send instead of the whole file
+        path = self.translate_path(self.path)
+        if path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        
+        representation = None
+        if self.server.live_reload and path.endswith('.html') and os.path.isfile(path):
+            representation = self.with_live_reload(path)
+        elif self.server.hot_cache:
+            representation = self.from_memory(path)
+        if representation is None:
+            if os.path.isdir(path) or not os.path.isfile(path):
+                return super().send_head()
+            stat = os.stat(path)
+            representation = self.negotiate(path, self.guess_type(path), stat)
+        
+        headers = {
+            'Content-Type': representation['ctype'],
+            'Last-Modified': self.date_time_string(representation['mtime']),
+        }
+        if representation['encoding']:
+            headers['Content-Encoding'] = representation['encoding']
+        if representation['encoding'] or is_compressible(representation['ctype']):
+            headers['Vary'] = 'Accept-Encoding'
+        
+        def etag():
+            return representation['etag'] or representation_etag(
+                path, stat, representation['encoding'], representation['path'])
+        
+        if not self.server.dev:
+            headers['ETag'] = etag()
+            headers['Cache-Control'] = cache_control(path)
+            if self.is_not_modified(headers['ETag'], representation['mtime']):
+                self.send_response(http.server.HTTPStatus.NOT_MODIFIED)
+                for name in ('ETag', 'Cache-Control', 'Vary', 'Last-Modified'):
+                    if name in headers:
+                        self.send_header(name, headers[name])
+                self.end_headers()
+                return None
+        
+        length = representation['length']
+        ranges = None
+        if 'Range' in self.headers and self.if_range_matches(etag, representation['mtime']):
+            ranges = parse_byte_ranges(self.headers['Range'], length)
+        if ranges == []:
+            self.send_response(http.server.HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{length}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        
+        if representation['data'] is not None:
+            file = io.BytesIO(representation['data'])
+        else:
+            file = open(representation['path'], 'rb')
+        try:
+            if ranges:
+                self.send_response(http.server.HTTPStatus.PARTIAL_CONTENT)
+                body_length = self.plan_ranges(ranges, length, headers)
+            else:
+                self.send_response(http.server.HTTPStatus.OK)
+                body_length = length
+            headers['Accept-Ranges'] = 'bytes'
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(body_length))
+            self.end_headers()
+            return file
+        except:
+            file.close()
+            raise
+    
+    def if_range_matches(self, etag, mtime):
+        """Whether a Range applies: no If-Range, or one naming the current version"""
+        if_range = self.headers.get('If-Range')
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            # If-Range uses the strong comparison, so weak tags never match
+            return if_range == etag()
+        try:
+            date = email.utils.parsedate_to_datetime(if_range)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        return date.timestamp() == int(mtime)
+    
+    def plan_ranges(self, ranges, length, headers):
+        """Set up the body for a 206 and its headers; returns the body length"""
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            headers['Content-Range'] = f'bytes {start}-{end}/{length}'
+            self.body_parts = [(start, end - start + 1)]
+            return end - start + 1
+        boundary = secrets.token_hex(16)
+        self.body_parts = []
+        for start, end in ranges:
+            self.body_parts.append((
+                f'\r\n--{boundary}\r\n'
+                f'Content-Type: {headers["Content-Type"]}\r\n'
+                f'Content-Range: bytes {start}-{end}/{length}\r\n\r\n'
+            ).encode('latin-1'))
+            self.body_parts.append((start, end - start + 1))
+        self.body_parts.append(f'\r\n--{boundary}--\r\n'.encode('latin-1'))
+        headers['Content-Type'] = f'multipart/byteranges; boundary={boundary}'
+        return sum(len(part) if isinstance(part, bytes) else part[1]
+                   for part in self.body_parts)
+    
+    def with_live_reload(self, path):
+        """An HTML page with the live-reload client injected, never encoded"""
+        with open(path, 'rb') as file:
+            data = inject_live_reload(file.read())
+        return {'encoding': None, 'path': None, 'data': data, 'length': len(data),
+                'etag': f'"{hashlib.sha256(data).hexdigest()[:20]}"',
+                'ctype': self.guess_type(path), 'mtime': os.stat(path).st_mtime}
+    
+    def do_GET(self):
+        if self.server.live_reload and self.path == RELOAD_ENDPOINT:
+            self.serve_reload_events()
+        elif self.path == METRICS_ENDPOINT:
+            self.serve_metrics()
+        else:
+            super().do_GET()
+    
+    def serve_metrics(self):
+        caches = [('compression', compression_cache)]
+        if self.server.hot_cache:
+            caches.insert(0, ('memory', self.server.hot_cache))
+        body = self.server.metrics.render(caches).encode('utf-8')
+        self.send_response(http.server.HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if not self.server.dev:
+            self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_reload_events(self):
+        """Stream live-reload messages until the page goes away"""
+        live_reload = self.server.live_reload
+        self.send_response(http.server.HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        client = live_reload.subscribe()
+        try:
+            self.wfile.write(b'retry: 500\n\n')
+            while True:
+                try:
+                    data = client.get(timeout=SSE_HEARTBEAT)
+                except queue.Empty:
+                    self.wfile.write(b': ping\n\n')
+                    continue
+                self.wfile.write(f'data: {data}\n\n'.encode('utf-8'))
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            live_reload.unsubscribe(client)
+    
+    def from_memory(self, path):
+        """Representation from the hot-file cache, loading the file on a miss"""
+        cache = self.server.hot_cache
+        if self.server.watching:
+            entry = cache.get(path)
+        else:
+            entry = cache.get(path, lambda entry: entry['stamps'] == file_stamps(path))
+        if entry is None:
+            if os.path.isdir(path):
+                return None
+            entry = load_hot_entry(path, self.guess_type(path))
+            if entry is None:
+                return None
+            cache.put(path, entry, entry['size'])
+        
+        codings = parse_accept_encoding(self.headers.get('Accept-Encoding', ''))
+        encoding = next((coding for coding, _ in ENCODING_SIBLINGS
+                         if coding in entry['variants'] and accepts_encoding(codings, coding)),
+                        None)
+        data, etag = entry['variants'][encoding]
+        return {'encoding': encoding, 'path': None, 'data': data, 'length': len(data),
+                'etag': etag, 'ctype': entry['ctype'], 'mtime': entry['mtime']}
+    
+    def negotiate(self, path, ctype, stat):
+        """Best representation on disk that the client accepts.
+        
+        Either the file to send ('path') or its bytes ('data') are set.
+        """
+        representation = {'encoding': None, 'path': path, 'data': None,
+                          'length': stat.st_size, 'etag': None, 'ctype': ctype,
+                          'mtime': stat.st_mtime}
+        codings = parse_accept_encoding(self.headers.get('Accept-Encoding', ''))
+        for coding, ext in ENCODING_SIBLINGS:
+            if not accepts_encoding(codings, coding):
+                continue
+            try:
+                sibling = os.stat(path + ext)
+            except OSError:
+                continue
+            # A sibling older than the file belongs to a previous build
+            if sibling.st_mtime_ns >= stat.st_mtime_ns:
+                return dict(representation, encoding=coding, path=path + ext,
+                            length=sibling.st_size)
+        if (is_compressible(ctype) and stat.st_size >= MIN_COMPRESS_SIZE
+                and accepts_encoding(codings, 'gzip')):
+            compressed = gzip_on_the_fly(path, stat)
+            if compressed is not None:
+                return dict(representation, encoding='gzip', path=None, data=compressed,
+                            length=len(compressed))
+        return representation
+    
+    def is_not_modified(self, etag, mtime):
+        """Evaluate If-None-Match, or If-Modified-Since when there is none"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            # If-None-Match uses the weak comparison
+            return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag
+                                           for tag in tags)
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        modified = datetime.datetime.fromtimestamp(int(mtime), datetime.timezone.utc)
+        return modified <= since
+    
+    def copyfile(self, source, outputfile):
+        """Send the planned byte ranges, or the whole file"""
+        if self.body_parts is None:
+            self.send_slice(source, outputfile, 0, None)
+            return
+        for part in self.body_parts:
+            if isinstance(part, bytes):
+                outputfile.write(part)
+            else:
+                self.send_slice(source, outputfile, *part)
+    
+    def send_slice(self, source, outputfile, offset, count):
+        """Send count bytes (or the rest) from offset, zero-copy for large regular files"""
+        try:
+            size = os.fstat(source.fileno()).st_size
+        except (OSError, io.UnsupportedOperation):
+            size = 0
+        remaining = size - offset if count is None else count
+        if self.server.use_sendfile and size and remaining >= SENDFILE_THRESHOLD:
+            # Falls back to send() itself when the socket isn't eligible
+            self.connection.sendfile(source, offset, count)
+            return
+        source.seek(offset)
+        if count is None:
+            shutil.copyfileobj(source, outputfile)
+            return
+        while count:
+            chunk = source.read(min(count, 64 * 1024))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            count -= len(chunk)
+    
+    def parse_request(self):
+        self.started = time.perf_counter()
+        self.response_status = None
+        self.response_length = 0
+        self.response_encoding = None
+        return super().parse_request()
+    
+    def handle(self):
+        """Serve the requests already sent; the server waits for the next one"""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self.request_pending():
+            self.handle_one_request()
+    
+    def request_pending(self):
+        """Whether the client has sent (part of) another request"""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        finally:
+            self.connection.settimeout(self.timeout)
+    
+    def finish(self):
+        # A kept-alive connection stays open for the server to wait on
+        if self.close_connection:
+            super().finish()
+    
+    def handle_one_request(self):
+        self.started = None
+        self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+        if self.started is not None and self.response_status is not None:
+            self.record_request(time.perf_counter() - self.started)
+    
+    def send_header(self, keyword, value):
+        name = keyword.lower()
+        if name == 'content-length':
+            self.response_length = int(value)
+        elif name == 'content-encoding':
+            self.response_encoding = value
+        super().send_header(keyword, value)
+    
+    def log_error(self, format, *args):
+        # send_error() reports each error response here; the access log has them
+        if not format.startswith('code %d'):
+            super().log_error(format, *args)
+    
+    def log_request(self, code='-', size='-'):
+        """Keep the status; the request is logged once its response is flushed"""
+        self.response_status = int(code)
+    
+    def record_request(self, seconds):
+        """Add a finished request to the metrics and the access log"""
+        headers = self.headers if self.command else {}
+        path = urllib.parse.urlsplit(self.path).path if self.command else ''
+        length = 0 if self.command == 'HEAD' else self.response_length
+        self.server.metrics.observe(path, self.command or '-', self.response_status,
+                                    seconds, self.response_encoding, length)
+        if self.server.access_log:
+            self.server.access_log.write({
+                'time': datetime.datetime.now(datetime.timezone.utc).isoformat(
+                    timespec='milliseconds'),
+                'client': self.client_address[0],
+                'method': self.command,
+                'path': self.path if self.command else None,
+                'protocol': self.request_version,
+                'status': self.response_status,
+                'bytes': length,
+                'encoding': self.response_encoding,
+                'duration_ms': round(seconds * 1000, 3),
+                'referer': headers.get('Referer'),
+                'user_agent': headers.get('User-Agent'),
+            })
+    
     def end_headers(self):
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        self.connection.settimeout(WRITE_TIMEOUT)
+        if self.server.dev:
+            self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+            self.send_header('Pragma', 'no-cache')
+            self.send_header('Expires', '0')
         super().end_headers()
 
-def main():
-    # Change to the directory containing this script
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTPServer that handles requests on a bounded thread pool.
+    
+    Connections without a request in flight wait on a selector thread,
+    so idle keep-alive clients never hold a worker.
+    """
+    
+    allow_reuse_address = True
+    request_queue_size = 1024
+    
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS, dev=False,
+                 memory_cache=0, use_sendfile=True, live_reload=None, access_log=None):
+        super().__init__(server_address, handler_class)
+        self.dev = dev
+        self.metrics = Metrics()
+        self.access_log = access_log
+        self.live_reload = live_reload
+        self.use_sendfile = use_sendfile
+        self.hot_cache = LRUCache(memory_cache) if memory_cache else None
+        self.watching = bool(self.hot_cache) and watch_inotify(
+            os.getcwd(), functools.partial(invalidate_hot_file, self.hot_cache))
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='serve')
+        
+        # Idle connections: handed over through a queue, the selector is
+        # only touched by its own thread
+        self.idle = selectors.DefaultSelector()
+        self.idle_queue = queue.SimpleQueue()
+        self.idle_closing = False
+        self.wakeup, self.wakeup_signal = socket.socketpair()
+        self.wakeup.setblocking(False)
+        self.idle.register(self.wakeup, selectors.EVENT_READ)
+        self.idle_thread = threading.Thread(target=self.wait_for_requests,
+                                            name='serve-idle', daemon=True)
+        self.idle_thread.start()
+    
+    def process_request(self, request, client_address):
+        # Even a new connection may not have sent anything yet (preconnects)
+        self.wait_for_request(request, (request, client_address))
+    
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+    
+    def wait_for_request(self, sock, connection):
+        """Park a connection until its next request arrives"""
+        self.idle_queue.put((sock, connection))
+        self.wakeup_signal.send(b'\0')
+    
+    def wait_for_requests(self):
+        """Selector thread: hand connections with a request to the pool"""
+        deadlines = {}      # socket -> time it is closed unless a request arrives
+        while not self.idle_closing:
+            timeout = max(min(deadlines.values()) - time.monotonic(), 0) if deadlines else None
+            for key, _ in self.idle.select(timeout):
+                if key.fileobj is self.wakeup:
+                    try:
+                        self.wakeup.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                self.idle.unregister(key.fileobj)
+                del deadlines[key.fileobj]
+                self.pool.submit(self.serve_connection, key.data)
+            
+            while not self.idle_queue.empty():
+                sock, connection = self.idle_queue.get()
+                self.idle.register(sock, selectors.EVENT_READ, connection)
+                deadlines[sock] = time.monotonic() + KEEPALIVE_TIMEOUT
+            
+            now = time.monotonic()
+            for sock in [sock for sock, deadline in deadlines.items() if deadline <= now]:
+                self.end_connection(self.idle.unregister(sock).data)
+                del deadlines[sock]
+        
+        for key in list(self.idle.get_map().values()):
+            if key.fileobj is not self.wakeup:
+                self.end_connection(key.data)
+        self.idle.close()
+    
+    def serve_connection(self, connection):
+        """Serve the requests waiting on a connection, then park or close it"""
+        try:
+            if isinstance(connection, tuple):
+                connection = self.finish_request(*connection)
+            else:
+                connection.handle()
+                connection.finish()
+        except Exception:
+            if isinstance(connection, tuple):
+                self.handle_error(*connection)
+            else:
+                self.handle_error(connection.request, connection.client_address)
+            self.end_connection(connection)
+            return
+        if connection.close_connection:
+            self.end_connection(connection)
+        else:
+            self.wait_for_request(connection.request, connection)
+    
+    def end_connection(self, connection):
+        """Close a new connection (request, address) or a handler's"""
+        if isinstance(connection, tuple):
+            self.shutdown_request(connection[0])
+            return
+        connection.close_connection = True
+        connection.finish()
+        self.shutdown_request(connection.request)
+    
+    def server_close(self):
+        super().server_close()
+        self.idle_closing = True
+        self.wakeup_signal.send(b'\0')
+        self.idle_thread.join()
+        self.wakeup.close()
+        self.wakeup_signal.close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.access_log:
+            self.access_log.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the website locally")
+    parser.add_argument('--host', default='',
+                        help="interface to bind (default: all interfaces)")
+    parser.add_argument('--port', type=int, default=PORT,
+                        help=f"port to listen on (default: {PORT})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"requests handled at once; idle keep-alive connections "
+                             f"don't count (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--dev', action='store_true',
+                        help="send no-store on every response instead of the cache policy")
+    parser.add_argument('--memory-cache', type=float, default=0, metavar='MB',
+                        help="serve files from an in-memory LRU cache of this size (default: off)")
+    parser.add_argument('--no-sendfile', action='store_true',
+                        help="copy files through userspace instead of sendfile(2)")
+    parser.add_argument('--directory', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="directory to serve (default: the website)")
+    parser.add_argument('--watch', action='store_true',
+                        help="rebuild changed sources and live-reload open pages (implies --dev)")
+    parser.add_argument('--access-log', metavar='FILE',
+                        help="append the JSON-lines access log to FILE (default: stderr)")
+    parser.add_argument('--no-access-log', action='store_true',
+                        help="don't write an access log")
+    parser.add_argument('--no-browser', action='store_true',
+                        help="don't open a browser window on start")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    # Serve from the website directory (the one containing this script)
+    os.chdir(args.directory)
+    
+    live_reload = None
+    if args.watch:
+        args.dev = True
+        live_reload = LiveReload(os.getcwd())
+    
+    access_log = None
+    if not args.no_access_log:
+        stream = open(args.access_log, 'a', encoding='utf-8') if args.access_log else sys.stderr
+        access_log = AccessLog(stream)
+    
+    with PooledHTTPServer((args.host, args.port), MyHTTPRequestHandler,
+                          workers=args.workers, dev=args.dev,
+                          memory_cache=int(args.memory_cache * 1024 * 1024),
+                          use_sendfile=not args.no_sendfile, live_reload=live_reload,
+                          access_log=access_log) as httpd:
+        port = httpd.server_address[1]
         print(f"🚀 Philip Wright website is now running!")
-        print(f"🌐 Open your browser and visit: http://localhost:{PORT}")
+        print(f"🌐 Open your browser and visit: http://localhost:{port}")
         print(f"📁 Serving files from: {os.getcwd()}")
+        print(f"🧵 {args.workers} workers, idle keep-alive connections wait without one")
+        print(f"🗄️  Caching: {'disabled (--dev)' if args.dev else 'ETags and per-type Cache-Control'}")
+        if httpd.hot_cache:
+            invalidation = 'inotify' if httpd.watching else 'mtime checks'
+            print(f"🔥 Memory cache: {args.memory_cache:g} MB, invalidated by {invalidation}")
+        print(f"📈 Metrics: http://localhost:{port}{METRICS_ENDPOINT}")
+        if live_reload:
+            print(f"👀 Watching for changes ({live_reload.start()}), live reload on")
         print(f"⏹️  Press Ctrl+C to stop the server")
         
-        try:
-            # Try to open the browser automatically
-            webbrowser.open(f'http://localhost:{PORT}')
-        except:
-            pass
-            
+        if not args.no_browser:
+            try:
+                # Try to open the browser automatically
+                webbrowser.open(f'http://localhost:{port}')
+            except:
+                pass
+        
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
@@ -0,0 +1,82 @@
+import os
+import json
+
+import pytest
+
+import optimize
+
+SITE = {
+    'index.html': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <title>Test</title>
+    <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+    <header><nav><a class="logo" href="/">Home</a></nav></header>
+    <section class="hero"><h1>Hello</h1></section>
+    <script src="script.js"></script>
+</body>
+</html>
+""",
+    'styles.css': """.logo { color: #ffffff; }
+.hero h1 { margin: 0px 0px 10px 0px; }
+.unused { color: red; }
+""",
+    'script.js': """document.querySelector('.hero').classList.add('ready');
+""",
+    'robots.txt': "User-agent: *\nAllow: /\n" * 20,
+}
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    for name, content in SITE.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def build(**options):
+    return optimize.optimize_performance(workers=1, **options)
+
+def stamps(root):
+    return {path: os.stat(path).st_mtime_ns
+            for path in (os.path.join(d, f) for d, _, files in os.walk(root) for f in files)}
+
+def test_noop_rebuild_touches_no_files(site):
+    assert build() == []
+    before = stamps(site)
+    assert build() == []
+    assert stamps(site) == before
+
+def test_css_usage_is_cached_until_a_scanned_source_changes(site, monkeypatch):
+    collect = optimize.collect_css_usage
+    calls = []
+    monkeypatch.setattr(optimize, 'collect_css_usage',
+                        lambda *args: calls.append(args) or collect(*args))
+    build()
+    build()
+    assert len(calls) == 1
+    (site / 'script.js').write_text("document.body.classList.add('unused');\n")
+    build()
+    assert len(calls) == 2
+    assert b'.unused' in (site / 'styles.min.css').read_bytes()
+
+def test_over_budget_build_reports_against_the_last_passing_build(site, capsys):
+    (site / 'performance-budget.json').write_text(json.dumps({'assets': {'script.js': {'raw': 200}}}))
+    assert build() == []
+    passing = json.loads((site / 'build-report.json').read_text())['budget_baseline']
+    passing_size = passing['assets']['script.js']['raw']
+    exported = stamps(site / 'dist')
+    
+    (site / 'script.js').write_text("document.querySelector('.hero').classList.add('ready');\n" * 5)
+    capsys.readouterr()
+    violations = build()
+    
+    report = json.loads((site / 'build-report.json').read_text())
+    size = report['budget_measurements']['assets']['script.js']['raw']
+    assert violations == [('script.js raw', size, 200)]
+    assert report['budget_baseline'] == passing
+    output = capsys.readouterr().out
+    assert f"script.js raw: {size:,} > 200, last passing build {passing_size:,}" in output
+    assert f"~ script.js raw: {passing_size:,} → {size:,}" in output
+    assert stamps(site / 'dist') == exported
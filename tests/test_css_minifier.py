@@ -0,0 +1,62 @@
+"""Table-driven tests for the CSS minifier.
+
+Each case pins the exact minified output for a construct whose whitespace
+or spelling is significant, so a tokenizer or serializer change that
+alters it fails here rather than in a browser.
+"""
+
+import pytest
+
+import optimize
+
+CASES = [
+    # calc() keeps the spaces around + and - that make them operators
+    ('a{width:calc(100% - 2 * 10px)}', 'a{width:calc(100% - 2 * 10px)}'),
+    ('a{width:calc( 100%  -  (2*10px) )}', 'a{width:calc(100% - (2*10px))}'),
+    ('a{margin:calc(1px + -2px)}', 'a{margin:calc(1px + -2px)}'),
+    ('a{width:min(10px , calc(50% - 1em))}', 'a{width:min(10px,calc(50% - 1em))}'),
+
+    # Strings and url() keep their contents
+    ('a:after{content:"a   b ; }"}', 'a:after{content:"a   b ; }"}'),
+    ("a{background:url( 'a b.png' )}", "a{background:url('a b.png')}"),
+    ('a{background:url("x  y.png")}', 'a{background:url("x  y.png")}'),
+    ('a{background:url( x.png )}', 'a{background:url(x.png)}'),
+
+    # Grid template strings are whitespace-sensitive
+    ('a{grid-template-areas:"head  head"\n  "nav   main"}',
+     'a{grid-template-areas:"head  head" "nav   main"}'),
+
+    # Numbers and units
+    ('a{margin:-0.50em}', 'a{margin:-.5em}'),
+    ('a{transition:all 0.0s}', 'a{transition:all 0s}'),
+    ('a{opacity:0.50;width:10.0px}', 'a{opacity:.5;width:10px}'),
+    ('a{margin:0px}', 'a{margin:0}'),
+    ('a{color:#FFFFFF}', 'a{color:#fff}'),
+
+    # Custom properties keep their value verbatim apart from outer
+    # whitespace; an empty one keeps a single space, since "--x:;" is
+    # rejected by browsers that predate empty custom properties
+    (':root{--x: ;--y:a}', ':root{--x: ;--y:a}'),
+    (':root{--x:  1px  2px ;}', ':root{--x:1px 2px}'),
+    (':root{--X:0.50em}', ':root{--X:0.50em}'),
+
+    # At-rule preludes
+    ('@media screen and (max-width : 600px){a{color:red}}',
+     '@media screen and (max-width:600px){a{color:red}}'),
+    ('@media (min-width:100px) and (max-width:200px){a{b:c}}',
+     '@media (min-width:100px) and (max-width:200px){a{b:c}}'),
+    ('@supports (display : grid) and (not (display:inline-grid)){a{b:c}}',
+     '@supports (display:grid) and (not (display:inline-grid)){a{b:c}}'),
+
+    # Selectors, comments and empty declarations
+    ('a  >  b  +  c ~ d{color : red ;}', 'a>b+c~d{color:red}'),
+    ('/* c */a{color:red;;}', 'a{color:red}'),
+]
+
+@pytest.mark.parametrize('source, expected', CASES)
+def test_minify_css(source, expected):
+    assert optimize.minify_css(source) == expected
+
+@pytest.mark.parametrize('source, expected', CASES)
+def test_minified_css_is_stable(source, expected):
+    assert optimize.minify_css(expected) == expected
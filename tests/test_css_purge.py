@@ -0,0 +1,35 @@
+import pytest
+
+import optimize
+
+def purge(tmp_path, html, js, css):
+    (tmp_path / 'index.html').write_text(html, encoding='utf-8')
+    (tmp_path / 'app.js').write_text(js, encoding='utf-8')
+    (tmp_path / 'site.css').write_text(css, encoding='utf-8')
+    sources = [str(tmp_path / name) for name in ('index.html', 'app.js', 'site.css')]
+    return optimize.purge_css(css, optimize.collect_css_usage(sources))[0]
+
+@pytest.mark.parametrize('js', [
+    "el.classList.add(`is-${state}`)",
+    "el.classList.toggle(`is-${state}`, true)",
+    "el.classList.add('x', `is-${state}`)",
+])
+def test_template_literal_class_prefix_is_kept(tmp_path, js):
+    purged = purge(tmp_path, '<div class="menu"></div>', js,
+                   '.menu{color:red}.is-open{color:blue}.unused{color:green}')
+    assert '.is-open' in purged
+    assert '.unused' not in purged
+
+def test_classlist_arguments_are_kept(tmp_path):
+    purged = purge(tmp_path, '<div></div>',
+                   "el.classList.add('visible', `plain`); el.classList.remove('gone')",
+                   '.visible{opacity:1}.plain{top:0}.gone{left:0}')
+    assert '.visible' in purged and '.plain' in purged
+    # Removing a class never puts it in the DOM
+    assert '.gone' not in purged
+
+def test_template_substitution_is_not_a_class(tmp_path):
+    purged = purge(tmp_path, '<div></div>', "el.classList.add(`is-${'other'}`)",
+                   '.other{color:red}.is-open{color:blue}')
+    assert '.is-open' in purged
+    assert '.other' not in purged
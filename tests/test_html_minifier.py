@@ -0,0 +1,58 @@
+"""Table-driven tests for the HTML minifier.
+
+Each case pins the exact minified output for markup whose whitespace,
+comments or attribute quoting the browser can observe.
+"""
+
+import pytest
+
+import optimize
+
+CASES = [
+    # <pre> and <textarea> keep their whitespace, including nested markup
+    ('<pre>  a\n   b  </pre>', '<pre>  a\n   b  </pre>'),
+    ('<pre><b> x </b>  y</pre>', '<pre><b> x </b>  y</pre>'),
+    ('<p>x</p>\n  <pre>\n  keep\n</pre>', '<p>x</p><pre>\n  keep\n</pre>'),
+    ('<textarea>  a\n  b </textarea>', '<textarea>  a\n  b </textarea>'),
+    ('<textarea>\n</textarea>', '<textarea>\n</textarea>'),
+
+    # Whitespace between inline elements collapses to one space but survives;
+    # whitespace between block elements goes
+    ('<p>a <b>b</b> <i>c</i></p>', '<p>a <b>b</b> <i>c</i></p>'),
+    ('<p>a    <b>b</b>\n\n   c</p>', '<p>a <b>b</b> c</p>'),
+    ('<span>a</span> <span>b</span>', '<span>a</span> <span>b</span>'),
+    ('<ul>\n  <li>a</li>\n  <li>b</li>\n</ul>', '<ul><li>a</li><li>b</li></ul>'),
+    ('<p>\n  text\n</p>', '<p>text</p>'),
+
+    # Comments go, conditional comments stay verbatim
+    ('<!-- drop --><p>x</p>', '<p>x</p>'),
+    ('<p>a<!-- c --> b</p>', '<p>a b</p>'),
+    ('<!--[if IE]><p>ie</p><![endif]--><p>x</p>', '<!--[if IE]><p>ie</p><![endif]--><p>x</p>'),
+    ('<!--[if lt IE 9]><script src=x.js></script><![endif]-->',
+     '<!--[if lt IE 9]><script src=x.js></script><![endif]-->'),
+
+    # JSON-LD is re-serialized compactly; string contents are untouched
+    ('<script type="application/ld+json">\n{\n  "@context": "https://schema.org",\n'
+     '  "name": "A  B"\n}\n</script>',
+     '<script type=application/ld+json>{"@context":"https://schema.org","name":"A  B"}</script>'),
+
+    # Attribute quotes are dropped only where the value allows it
+    ('<div class="a" id="b">x</div>', '<div class=a id=b>x</div>'),
+    ('<div class="a b" data-x="c d">x</div>', '<div class="a b" data-x="c d">x</div>'),
+    ('<a href="/a/b">x</a><a href="a=b">y</a>', '<a href=/a/b>x</a><a href="a=b">y</a>'),
+    ('<input value="a>b"><input value="a`b">', '<input value="a>b"><input value="a`b">'),
+    ('<input value="a\'b">', '<input value="a\'b">'),
+    ('<input value="">', '<input value>'),
+]
+
+@pytest.mark.parametrize('source, expected', CASES)
+def test_minify_html(source, expected):
+    assert optimize.minify_html(source) == expected
+
+@pytest.mark.parametrize('source, expected', CASES)
+def test_minified_html_is_stable(source, expected):
+    assert optimize.minify_html(expected) == expected
+
+def test_invalid_json_ld_is_an_error():
+    with pytest.raises(ValueError):
+        optimize.minify_html('<script type="application/ld+json">{bad json</script>')
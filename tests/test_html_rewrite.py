@@ -0,0 +1,74 @@
+"""Tests for in-place HTML rewriting (rewrite_html)."""
+
+import pytest
+
+import optimize
+
+DOCUMENT = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Test</title>
+    <!-- <script src="commented.js"></script> -->
+    <script>var tag = '<script src="quoted.js"></script>';</script>
+</head>
+<body>
+    <section class=card><p>x</p></section>
+    <SECTION  id='plain'>y</SECTION>
+</body>
+</html>
+"""
+
+CLASSES = [('section.card', ['is-visible', 'fade']), ('section', ['observed'])]
+
+INJECTIONS = [
+    ('head', '<script src="commented.js"></script>'),
+    ('head', '<script src="quoted.js"></script>'),
+    ('body', '<script>first()</script>'),
+    ('body', '<script>second()</script>'),
+]
+
+def test_rewrite():
+    assert optimize.rewrite_html(DOCUMENT, CLASSES, INJECTIONS) == """<!DOCTYPE html>
+<html>
+<head>
+    <title>Test</title>
+    <!-- <script src="commented.js"></script> -->
+    <script>var tag = '<script src="quoted.js"></script>';</script>
+    <script src="commented.js"></script>
+    <script src="quoted.js"></script>
+</head>
+<body>
+    <section class="card is-visible fade observed"><p>x</p></section>
+    <SECTION  id='plain' class="observed">y</SECTION>
+    <script>first()</script>
+    <script>second()</script>
+</body>
+</html>
+"""
+
+def test_second_pass_is_byte_identical():
+    once = optimize.rewrite_html(DOCUMENT, CLASSES, INJECTIONS)
+    assert optimize.rewrite_html(once, CLASSES, INJECTIONS) == once
+
+def test_nothing_to_do_keeps_the_document():
+    assert optimize.rewrite_html(DOCUMENT) == DOCUMENT
+
+@pytest.mark.parametrize('start_tag, expected', [
+    ('<section class=card>', '<section class="card is-visible">'),
+    ("<section class='card is-visible'>", "<section class='card is-visible'>"),
+    ('<section>', '<section class="is-visible">'),
+    ('<img src="a.png"/>', '<img src="a.png" class="is-visible"/>'),
+    ('<img src=a.png/>', '<img src=a.png/ class="is-visible">'),
+    ('<input disabled/>', '<input disabled class="is-visible"/>'),
+])
+def test_add_classes(start_tag, expected):
+    assert optimize._html_add_classes(start_tag, ['is-visible']) == expected
+
+def test_injections_at_the_same_offset_keep_their_order():
+    injections = [('body', f'<script>step{n}()</script>') for n in range(4)]
+    body = optimize.rewrite_html('<body>\n</body>', injections=injections)
+    assert body == '<body>\n' + ''.join(f'    <script>step{n}()</script>\n' for n in range(4)) + '</body>'
+
+def test_missing_end_tag_is_an_error():
+    with pytest.raises(ValueError):
+        optimize.rewrite_html('<p>no body end tag', injections=[('body', '<script>x()</script>')])
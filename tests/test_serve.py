@@ -0,0 +1,74 @@
+import http.client
+import threading
+import time
+
+import pytest
+
+import serve
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-', [(0, 202)]),
+    ('bytes=0-9', [(0, 9)]),
+    ('bytes=200-', [(200, 202)]),
+    ('bytes=200-5000', [(200, 202)]),
+    ('bytes=-10', [(193, 202)]),
+    ('bytes=-5000', [(0, 202)]),
+    ('bytes=0-4,5-9', [(0, 9)]),
+    ('bytes=10-20,15-', [(10, 202)]),
+    # Open-ended ranges starting at or past the end are unsatisfiable, not ignored
+    ('bytes=203-', []),
+    ('bytes=5000-', []),
+    ('bytes=-0', []),
+    ('bytes=5-3', None),
+    ('bytes=a-b', None),
+    ('bytes=-', None),
+    ('items=0-9', None),
+])
+def test_parse_byte_ranges(header, expected):
+    assert serve.parse_byte_ranges(header, 203) == expected
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    (tmp_path / 'robots.txt').write_bytes(b'x' * 203)
+    monkeypatch.chdir(tmp_path)
+    httpd = serve.PooledHTTPServer(('127.0.0.1', 0), serve.MyHTTPRequestHandler, workers=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+def get(port, path, headers):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.getheader('Content-Range'), response.read()
+    finally:
+        connection.close()
+
+@pytest.mark.parametrize('header, status, content_range, body', [
+    ('bytes=0-9', 206, 'bytes 0-9/203', b'x' * 10),
+    ('bytes=200-', 206, 'bytes 200-202/203', b'xxx'),
+    ('bytes=203-', 416, 'bytes */203', b''),
+    ('bytes=5000-', 416, 'bytes */203', b''),
+    ('bytes=5-3', 200, None, b'x' * 203),
+])
+def test_range_requests(server, header, status, content_range, body):
+    headers = {'Range': header, 'Accept-Encoding': 'identity'}
+    assert get(server, '/robots.txt', headers) == (status, content_range, body)
+
+def test_idle_keepalive_connections_do_not_hold_workers(server):
+    # More persistent connections than workers, all kept open between requests
+    connections = [http.client.HTTPConnection('127.0.0.1', server, timeout=5) for _ in range(6)]
+    try:
+        started = time.monotonic()
+        for _ in range(3):
+            for connection in connections:
+                connection.request('GET', '/robots.txt', headers={'Accept-Encoding': 'identity'})
+                response = connection.getresponse()
+                assert response.status == 200 and len(response.read()) == 203
+        assert time.monotonic() - started < 2
+    finally:
+        for connection in connections:
+            connection.close()